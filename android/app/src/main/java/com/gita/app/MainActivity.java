@@ -1,18 +1,28 @@
 package com.gita.app;
 
+import android.net.Uri;
 import android.os.Bundle;
 import android.speech.tts.TextToSpeech;
 import android.speech.tts.Voice;
 import android.speech.tts.UtteranceProgressListener;
 import android.webkit.JavascriptInterface;
+import android.webkit.WebResourceRequest;
+import android.webkit.WebResourceResponse;
 import android.webkit.WebView;
 import android.webkit.WebViewClient;
 import androidx.appcompat.app.AppCompatActivity;
 
+import org.json.JSONObject;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.HashSet;
+import java.util.List;
 import java.util.Locale;
 import java.util.Set;
+import java.util.zip.GZIPInputStream;
 
 public class MainActivity extends AppCompatActivity {
 
@@ -20,9 +30,10 @@ public class MainActivity extends AppCompatActivity {
     private TextToSpeech tts;
     private boolean ttsReady = false;
 
-    private String pendingText = null;
+    // Utterances ({text, id}) and settings received before the engine was ready
+    private final List<String[]> pending = new ArrayList<>();
     private String pendingGender = "female";
-    private String pendingSpeed  = "slow";
+    private float pendingRate = 0.82f;
 
     // FULL male voice pattern list
     private final Set<String> MALE_PATTERNS = new HashSet<>(Arrays.asList(
@@ -48,19 +59,26 @@ public class MainActivity extends AppCompatActivity {
         setContentView(webView);
 
         webView.getSettings().setJavaScriptEnabled(true);
-        webView.setWebViewClient(new WebViewClient());
+        webView.setWebViewClient(new WebViewClient() {
+            @Override
+            public WebResourceResponse shouldInterceptRequest(WebView view, WebResourceRequest request) {
+                WebResourceResponse r = openPrecompressedAsset(request.getUrl());
+                return r != null ? r : super.shouldInterceptRequest(view, request);
+            }
+        });
         webView.addJavascriptInterface(new JSBridge(), "Android");
 
         tts = new TextToSpeech(this, status -> {
             if (status == TextToSpeech.SUCCESS) {
-                ttsReady = true;
                 try { tts.setLanguage(new Locale("hi", "IN")); } catch (Exception ignored) {}
-
-                setVoiceInternal("female");
-
-                if (pendingText != null) {
-                    speakInternal(pendingText, pendingGender, pendingSpeed);
-                    pendingText = null;
+                tts.setOnUtteranceProgressListener(new UtteranceEvents());
+
+                synchronized (pending) {
+                    ttsReady = true;
+                    setVoiceInternal(pendingGender);
+                    tts.setSpeechRate(pendingRate);
+                    for (String[] u : pending) enqueueInternal(u[0], u[1]);
+                    pending.clear();
                 }
             }
         });
@@ -69,23 +87,54 @@ public class MainActivity extends AppCompatActivity {
     }
 
 
+    // ============================================================
+    // Precompressed assets: generate_html.py ships chunks as .gz only
+    // ============================================================
+    private static final String ASSET_PREFIX = "/android_asset/";
+
+    private WebResourceResponse openPrecompressedAsset(Uri uri) {
+        if (!"file".equals(uri.getScheme())) return null;
+        String path = uri.getPath();
+        if (path == null || !path.startsWith(ASSET_PREFIX)) return null;
+
+        String asset = path.substring(ASSET_PREFIX.length());
+        String mime = asset.endsWith(".js")   ? "application/javascript" :
+                      asset.endsWith(".html") ? "text/html" :
+                      asset.endsWith(".json") ? "application/json" : null;
+        if (mime == null) return null;
+
+        try {
+            InputStream in = new GZIPInputStream(getAssets().open(asset + ".gz"));
+            return new WebResourceResponse(mime, "UTF-8", in);
+        } catch (IOException e) {
+            return null; // no .gz copy: let the WebView load the plain asset
+        }
+    }
+
+
     // ============================================================
     // JS → Android Bridge
     // ============================================================
     private class JSBridge {
+        // Queued behind the utterances already playing; the page keeps a few
+        // ahead so there is no gap between them.
         @JavascriptInterface
-        public void speak(String txt, String gender, String speed) {
-            speakInternal(txt, gender, speed);
+        public void enqueue(String txt, String id) {
+            enqueueInternal(txt, id);
         }
 
         @JavascriptInterface
         public void stopSpeak() {
+            synchronized (pending) { pending.clear(); }
             try { tts.stop(); } catch (Exception ignored) {}
         }
 
         @JavascriptInterface
         public void setVoice(String gender) {
-            setVoiceInternal(gender);
+            synchronized (pending) {
+                pendingGender = gender;
+                if (ttsReady) setVoiceInternal(gender);
+            }
         }
 
         @JavascriptInterface
@@ -93,7 +142,10 @@ public class MainActivity extends AppCompatActivity {
             float rate = speed.equals("very_slow") ? 0.72f :
                          speed.equals("slow")      ? 0.82f :
                                                      0.95f;
-            try { tts.setSpeechRate(rate); } catch (Exception ignored) {}
+            synchronized (pending) {
+                pendingRate = rate;
+                if (ttsReady) try { tts.setSpeechRate(rate); } catch (Exception ignored) {}
+            }
         }
 
         @JavascriptInterface
@@ -141,35 +193,32 @@ public class MainActivity extends AppCompatActivity {
     }
 
     // ============================================================
-    // SPEAK ENGINE + CALLBACK
+    // SPEAK ENGINE + CALLBACKS
     // ============================================================
-    private void speakInternal(String text, String gender, String speed) {
-        if (!ttsReady) {
-            pendingText  = text;
-            pendingGender = gender;
-            pendingSpeed  = speed;
-            return;
+    private void enqueueInternal(String text, String id) {
+        synchronized (pending) {
+            if (!ttsReady) {
+                pending.add(new String[]{text, id});
+                return;
+            }
         }
+        tts.speak(text, TextToSpeech.QUEUE_ADD, null, id);
+    }
 
-        setVoiceInternal(gender);
-
-        float rate = speed.equals("very_slow") ? 0.72f :
-                     speed.equals("slow")      ? 0.82f : 0.95f;
-        tts.setSpeechRate(rate);
-
-        tts.setOnUtteranceProgressListener(new UtteranceProgressListener() {
-            @Override public void onStart(String id) {}
+    // Set once: reports each utterance id to the page when it starts (the
+    // page moves the highlight then) and when it is done.
+    private class UtteranceEvents extends UtteranceProgressListener {
+        @Override public void onStart(String id) { callPage("onUtteranceStart", id); }
 
-            @Override public void onDone(String id) {
-                runOnUiThread(() ->
-                    webView.evaluateJavascript("onSpeakComplete();", null)
-                );
-            }
+        @Override public void onDone(String id) { callPage("onUtteranceDone", id); }
 
-            @Override public void onError(String id) {}
-        });
+        // Counted as done so the queue keeps moving past a failed segment.
+        @Override public void onError(String id) { callPage("onUtteranceDone", id); }
+    }
 
-        tts.speak(text, TextToSpeech.QUEUE_FLUSH, null, "UTTID");
+    private void callPage(String function, String id) {
+        String js = function + "(" + JSONObject.quote(id) + ");";
+        runOnUiThread(() -> webView.evaluateJavascript(js, null));
     }
 
     @Override
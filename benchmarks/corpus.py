@@ -0,0 +1,68 @@
+# benchmarks/corpus.py
+"""
+Synthetic SECTION corpora for benchmarking at sizes beyond the real data.
+
+Verse texts are taken from the real corpus so string lengths and the
+Devanagari mix stay realistic. References walk through all 700 Gita verses
+in order, so corpora above 700 verses cite each verse several times, as a
+growing problem catalogue would; every citation of a reference carries the
+same Sanskrit, so the result passes data/validate.py.
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+from data.validate import VERSES_PER_CHAPTER
+
+VERSES_PER_PROBLEM = 4
+PROBLEMS_PER_SECTION = 20
+
+REFERENCES: List[Tuple[int, int]] = [
+    (c, v) for c, count in enumerate(VERSES_PER_CHAPTER, 1) for v in range(1, count + 1)
+]
+
+
+def real_verses() -> List[Dict[str, Any]]:
+    from data.shlokas import load_all_sections
+
+    return [v for sec in load_all_sections().values() for verses in sec.values() for v in verses]
+
+
+def synthetic_sections(n_verses: int, seed_verses: List[Dict[str, Any]] = None) -> Dict[str, Dict[str, list]]:
+    """{basename: {problem title: [verse dicts]}} holding `n_verses` verses."""
+    seed = seed_verses or real_verses()
+    sections: Dict[str, Dict[str, list]] = {}
+    per_section = VERSES_PER_PROBLEM * PROBLEMS_PER_SECTION
+    for i in range(n_verses):
+        chapter, verse = REFERENCES[i % len(REFERENCES)]
+        ref_seed = seed[(i % len(REFERENCES)) % len(seed)]
+        body = seed[i % len(seed)]
+        s, p = divmod(i, per_section)
+        section = sections.setdefault(f"SECTION_{s + 1}", {})
+        title = f"{s * PROBLEMS_PER_SECTION + p // VERSES_PER_PROBLEM + 1}. {body['hindi_arth'][:24].strip()}"
+        section.setdefault(title, []).append({
+            "id": i + 1,
+            "chapter": chapter,
+            "verse": verse,
+            "sanskrit": f"{ref_seed['sanskrit']} ॥{chapter}.{verse}॥",
+            "hindi_arth": body["hindi_arth"],
+            "saral_samajh": body["saral_samajh"],
+            "udaharan": body["udaharan"],
+        })
+    return sections
+
+
+def section_map(sections: Dict[str, Any]) -> Dict[str, str]:
+    return {m: m.lower() for m in sections}
+
+
+def write_modules(sections: Dict[str, Any], directory: str) -> List[str]:
+    """Write the corpus as SECTION_<n>.py modules (same shape as data/)."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for mod_basename, attr in section_map(sections).items():
+        path = os.path.join(directory, f"{mod_basename}.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {mod_basename}.py (synthetic benchmark corpus)\n\n{attr} = {sections[mod_basename]!r}\n")
+        paths.append(path)
+    return paths
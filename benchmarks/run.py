@@ -0,0 +1,230 @@
+# benchmarks/run.py
+"""
+Benchmarks for the load, flatten, generate and export paths.
+
+    python -m benchmarks.run [--sizes 700,7000,70000] [--repeat 5]
+                             [--only flatten,export_to_txt] [--out results.json]
+                             [--compare benchmarks/results/<commit>.json]
+
+Each benchmark runs on a synthetic corpus (benchmarks/corpus.py) of every
+requested size; `shlokas.import` measures the real data/ package in a fresh
+interpreter. Results go to benchmarks/results/<commit>.json by default so
+runs from different commits can be compared with --compare.
+"""
+
+import gc
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import section_map, synthetic_sections, write_modules
+from data.snapshot import build_snapshot, open_snapshot
+from data.verses import flatten
+from utils.exporter import export_to_txt
+import generate_html
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+DEFAULT_SIZES = (700, 7000, 70000)
+DEFAULT_REPEAT = 5
+
+
+def timed(fn, repeat):
+    """Run fn() `repeat` times; returns the list of wall-clock seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ------------------------------------------------------------------
+# Benchmarks: name -> function(corpus, workdir) returning a zero-arg callable
+# ------------------------------------------------------------------
+def bench_sections_import(corpus, workdir):
+    mod_dir = os.path.join(workdir, "modules")
+    names = list(section_map(corpus))
+    write_modules(corpus, mod_dir)
+    sys.path.insert(0, mod_dir)
+    importlib.invalidate_caches()
+    for m in names:
+        sys.modules.pop(m, None)    # left over from a smaller corpus
+    for m in names:     # first import writes the .pyc, as a real install would have
+        importlib.import_module(m)
+
+    def run():
+        for m in names:
+            sys.modules.pop(m, None)
+        for m in names:
+            importlib.import_module(m)
+    return run
+
+
+def bench_sections_snapshot(corpus, workdir):
+    path = os.path.join(workdir, "corpus.snap")
+    with open(path, "wb") as f:
+        f.write(build_snapshot(corpus, section_map(corpus)))
+
+    def run():
+        with open_snapshot(path) as snap:
+            for m in snap.section_names():
+                snap.decode_section(m)
+    return run
+
+
+def bench_flatten(corpus, workdir):
+    # What main.py runs to build the verse list.
+    return lambda: flatten(corpus)
+
+
+def bench_flatten_sections(corpus, workdir):
+    return lambda: generate_html.flatten_sections(corpus)
+
+
+def bench_gen_js_array(corpus, workdir):
+    flat = flatten(corpus)
+    return lambda: generate_html.gen_js_array(flat)
+
+
+def bench_generate_html(corpus, workdir):
+    flat = flatten(corpus)
+    return lambda: generate_html.generate_html(flat)
+
+
+def bench_export_to_txt(corpus, workdir):
+    flat = flatten(corpus)
+    path = os.path.join(workdir, "export.txt")
+    return lambda: export_to_txt(flat, path)
+
+
+BENCHMARKS = {
+    "sections.import": bench_sections_import,
+    "sections.snapshot": bench_sections_snapshot,
+    "flatten": bench_flatten,
+    "flatten_sections": bench_flatten_sections,
+    "gen_js_array": bench_gen_js_array,
+    "generate_html": bench_generate_html,
+    "export_to_txt": bench_export_to_txt,
+}
+
+
+def bench_shlokas_import(repeat):
+    """`import data.shlokas` + loading every section, in a fresh interpreter each time."""
+    code = (
+        "import time; t = time.perf_counter(); import data.shlokas as s; "
+        "s.load_all_sections(); print(time.perf_counter() - t)"
+    )
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def summarize(name, size, times):
+    return {
+        "name": name,
+        "size": size,
+        "repeat": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+    }
+
+
+def run(sizes, repeat, only=None):
+    results = []
+
+    def record(name, size, times):
+        r = summarize(name, size, times)
+        results.append(r)
+        print(f"  {name:<20} {str(size):>7}  min {r['min'] * 1000:9.2f} ms  median {r['median'] * 1000:9.2f} ms")
+
+    if not only or "shlokas.import" in only:
+        record("shlokas.import", "real", bench_shlokas_import(repeat))
+
+    for size in sizes:
+        corpus = synthetic_sections(size)
+        # Larger corpora get fewer rounds so a full run stays in minutes.
+        rounds = repeat if size <= 10000 else max(1, repeat // 5)
+        for name, setup in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            workdir = tempfile.mkdtemp(prefix="gita-bench-")
+            try:
+                record(name, size, timed(setup(corpus, workdir), rounds))
+            finally:
+                sys.path[:] = [p for p in sys.path if not p.startswith(workdir)]
+                shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], str(r["size"])): r for r in json.load(f)["results"]}
+    print(f"\n📊 vs {os.path.basename(baseline_path)} (median, >1.0 is slower)")
+    for r in results:
+        old = baseline.get((r["name"], str(r["size"])))
+        if old:
+            ratio = r["median"] / old["median"] if old["median"] else float("inf")
+            flag = "⚠️ " if ratio > 1.10 else "   "
+            print(f"{flag}{r['name']:<20} {str(r['size']):>7}  {ratio:5.2f}x")
+
+
+def _arg(name, default=None):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return default
+
+
+def main():
+    sizes = [int(s) for s in _arg("--sizes", ",".join(map(str, DEFAULT_SIZES))).split(",")]
+    repeat = int(_arg("--repeat", DEFAULT_REPEAT))
+    only = _arg("--only")
+    only = set(only.split(",")) if only else None
+    commit = git_commit()
+
+    print(f"⏱  Benchmarks @ {commit}, sizes {sizes}, repeat {repeat}")
+    results = run(sizes, repeat, only)
+
+    out = _arg("--out") or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "results": results,
+        }, f, indent=2)
+    print(f"✔ Results written: {out}")
+
+    baseline = _arg("--compare")
+    if baseline:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
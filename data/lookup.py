@@ -0,0 +1,115 @@
+# data/lookup.py
+"""
+Constant-time verse lookup by (chapter, verse) and by global id.
+
+The same Gita verse can be cited under several problem titles (2.47 may
+appear in more than one SECTION), so a reference resolves to the list of
+all verse records that cite it, in corpus order. Ranges such as "13-14" are
+indexed under every verse they cover.
+
+References are written "2.47", "2:47", "BG 2.47", "12.13-14" or, for ids,
+"id=25" / "#25"; Devanagari digits are accepted.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_DIGITS = str.maketrans({chr(0x0966 + d): str(d) for d in range(10)})
+_REF_RE = re.compile(r"^\s*(?:bg\s*)?(\d+)\s*[.:]\s*(\d+)(?:\s*-\s*(\d+))?\s*$", re.I)
+_ID_RE = re.compile(r"^\s*(?:id\s*[=:]?|#)\s*(\d+)\s*$", re.I)
+
+
+def verse_numbers(value) -> List[int]:
+    """Verse numbers covered by a verse field: 47 -> [47], "13-14" -> [13, 14]."""
+    if isinstance(value, int):
+        return [value]
+    start, sep, end = str(value).partition("-")
+    if not start.strip().isdigit():
+        return []
+    start = int(start)
+    end = int(end) if sep and end.strip().isdigit() else start
+    return list(range(start, max(start, end) + 1))
+
+
+def ref_key(chapter: int, verse: int) -> str:
+    return f"{chapter}.{verse}"
+
+
+def parse_ref(ref: str) -> Optional[Tuple[str, Tuple[int, ...]]]:
+    """
+    Parse a reference string into ("ref", (chapter, first, last)) or
+    ("id", (id,)). Returns None if it is neither.
+    """
+    ref = ref.translate(_DIGITS)
+    m = _REF_RE.match(ref)
+    if m:
+        first = int(m.group(2))
+        return "ref", (int(m.group(1)), first, int(m.group(3) or first))
+    m = _ID_RE.match(ref)
+    if m:
+        return "id", (int(m.group(1)),)
+    return None
+
+
+class VerseLookup:
+    """(chapter, verse) and id index over a list of verse records (data.verses.Verse)."""
+
+    def __init__(self, verses: Sequence):
+        self.by_ref: Dict[Tuple[int, int], List[int]] = {}
+        self.by_id: Dict[int, int] = {}
+        for i, v in enumerate(verses):
+            if v.id is not None:
+                self.by_id.setdefault(v.id, i)
+            try:
+                chapter = int(v.chapter)
+            except (TypeError, ValueError):
+                continue
+            for n in verse_numbers(v.verse):
+                self.by_ref.setdefault((chapter, n), []).append(i)
+
+    def resolve(self, chapter: int, verse: int) -> List[int]:
+        """Indices of every record citing chapter.verse (empty if none)."""
+        return self.by_ref.get((chapter, verse), [])
+
+    def resolve_ref(self, ref: str) -> List[int]:
+        """Resolve a reference string (see module docstring) to verse indices."""
+        parsed = parse_ref(ref)
+        if parsed is None:
+            return []
+        kind, args = parsed
+        if kind == "id":
+            i = self.by_id.get(args[0])
+            return [] if i is None else [i]
+        chapter, first, last = args
+        if first == last:
+            return list(self.resolve(chapter, first))
+        hits: List[int] = []
+        for n in range(first, last + 1):
+            hits += [i for i in self.resolve(chapter, n) if i not in hits]
+        return hits
+
+    def to_compact(self) -> Dict[str, dict]:
+        """Serialisable form for the HTML page: {"refs": {"2.47": [i, ...]}, "ids": {"25": i}}."""
+        return {
+            "refs": {ref_key(c, v): hits for (c, v), hits in self.by_ref.items()},
+            "ids": {str(k): i for k, i in self.by_id.items()},
+        }
+
+
+def build_lookup(verses: Sequence) -> VerseLookup:
+    return VerseLookup(verses)
+
+
+__all__ = ["VerseLookup", "build_lookup", "parse_ref", "ref_key", "verse_numbers"]
+
+
+if __name__ == "__main__":
+    import sys
+    from data.verses import flatten
+
+    verses = flatten()
+    lookup = build_lookup(verses)
+    print(f"✔ {len(lookup.by_ref)} verse references, {len(lookup.by_id)} ids")
+    for ref in sys.argv[1:] or ["2.47"]:
+        hits = lookup.resolve_ref(ref)
+        print(f"🔎 {ref}: " + (", ".join(f"{verses[i].problem} ({verses[i].reference})" for i in hits) or "not found"))
@@ -0,0 +1,183 @@
+# data/search.py
+"""
+Full-text search over the verse store.
+
+An inverted index is built once over the Sanskrit text, the Hindi meaning,
+the simple explanation, the example and the problem title. Text is
+normalised with Devanagari-aware rules so that common spelling variants
+match each other:
+
+ - nukta letters fold to their base letter (ज़ -> ज, ड़ -> ड)
+ - long vowels and matras fold to short ones (ई/ी -> इ/ि, ऊ/ू -> उ/ु)
+ - chandrabindu and half nasals fold to anusvara (शान्ति -> शांति)
+ - virama / avagraha / ZWJ / ZWNJ are dropped
+ - Devanagari digits become ASCII digits, Latin text is lower-cased
+
+Every query token must match (exactly or as a prefix of an indexed term);
+hits are ranked by a field-weighted tf-idf score. Prefix expansion is a
+bisect over the sorted term list, so queries stay in the low milliseconds
+even for the full 700-verse corpus with several commentaries.
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# field name -> weight in the ranking score
+DEFAULT_FIELDS: Dict[str, float] = {
+    "problem": 2.0,
+    "sanskrit": 1.5,
+    "hindi_arth": 1.5,
+    "saral_samajh": 1.0,
+    "udaharan": 1.0,
+}
+
+PREFIX_PENALTY = 0.6        # a prefix match scores less than an exact match
+MAX_PREFIX_EXPANSION = 64   # cap on indexed terms a single prefix may expand to
+
+_FOLD = str.maketrans({
+    "\u093c": None,        # nukta
+    "\u094d": None,        # virama
+    "\u093d": None,        # avagraha
+    "\u200c": None,        # ZWNJ
+    "\u200d": None,        # ZWJ
+    "\u0901": "\u0902",    # chandrabindu -> anusvara
+    "\u0940": "\u093f",    # ी -> ि
+    "\u0942": "\u0941",    # ू -> ु
+    "\u0908": "\u0907",    # ई -> इ
+    "\u090a": "\u0909",    # ऊ -> उ
+    **{chr(0x0966 + d): str(d) for d in range(10)},
+})
+
+# A nasal consonant + virama before another consonant is written as anusvara.
+_HALF_NASAL_RE = re.compile("[\u0919\u091e\u0923\u0928\u092e]\u094d(?=[\u0915-\u0939])")
+
+# Devanagari letters and signs (minus the danda punctuation) or any word char.
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0971-\u097f]+")
+
+
+def normalize(text: str) -> str:
+    """Fold spelling variants so that equivalent Hindi/Sanskrit text compares equal."""
+    # NFD splits precomposed nukta letters (U+0958..U+095F) into base + nukta.
+    text = unicodedata.normalize("NFD", text)
+    return _HALF_NASAL_RE.sub("\u0902", text).translate(_FOLD).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """Inverted index over a list of verse records (see data.verses.Verse)."""
+
+    def __init__(self, verses: Sequence, fields: Optional[Dict[str, float]] = None):
+        self.fields = dict(fields or DEFAULT_FIELDS)
+        self.size = len(verses)
+
+        weighted: Dict[str, Dict[int, float]] = {}
+        for doc, v in enumerate(verses):
+            for field, weight in self.fields.items():
+                for term in tokenize(getattr(v, field, "")):
+                    postings = weighted.setdefault(term, {})
+                    postings[doc] = postings.get(doc, 0.0) + weight
+
+        # term -> [(doc, score contribution)], with idf folded in once here
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for term, postings in weighted.items():
+            idf = math.log(1.0 + self.size / len(postings))
+            self._postings[term] = [
+                (doc, (1.0 + math.log(tf)) * idf) for doc, tf in sorted(postings.items())
+            ]
+        self._terms = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def expand(self, token: str) -> Iterable[Tuple[str, float]]:
+        """Indexed terms matching `token` exactly or by prefix, with their factor."""
+        if token in self._postings:
+            yield token, 1.0
+        i = bisect_left(self._terms, token)
+        n = 0
+        while i < len(self._terms) and n < MAX_PREFIX_EXPANSION:
+            term = self._terms[i]
+            if not term.startswith(token):
+                break
+            if term != token:
+                yield term, PREFIX_PENALTY
+                n += 1
+            i += 1
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Tuple[int, float]]:
+        """
+        Return [(verse index, score), ...] best first. Every query token must
+        match; ties keep corpus order.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        for token in tokens:
+            token_scores: Dict[int, float] = {}
+            for term, factor in self.expand(token):
+                for doc, s in self._postings[term]:
+                    s *= factor
+                    if s > token_scores.get(doc, 0.0):
+                        token_scores[doc] = s
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {d: scores[d] + s for d, s in token_scores.items() if d in scores}
+            if not scores:
+                return []
+
+        hits = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return hits[:limit] if limit else hits
+
+    def to_compact(self, precision: int = 100) -> Dict[str, list]:
+        """
+        Serialisable form for client-side search (see generate_html.py):
+        sorted "terms" and, per term, a flat [doc, score, doc, score, ...]
+        posting list with scores scaled to ints by `precision`.
+        """
+        postings = []
+        for term in self._terms:
+            flat: List[int] = []
+            for doc, score in self._postings[term]:
+                flat.append(doc)
+                flat.append(max(1, round(score * precision)))
+            postings.append(flat)
+        return {"terms": self._terms, "postings": postings, "precision": precision}
+
+
+def build_index(verses: Sequence, fields: Optional[Dict[str, float]] = None) -> SearchIndex:
+    return SearchIndex(verses, fields)
+
+
+__all__ = ["SearchIndex", "build_index", "normalize", "tokenize", "DEFAULT_FIELDS"]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from data.verses import flatten
+
+    verses = flatten()
+    t0 = time.perf_counter()
+    index = build_index(verses)
+    t1 = time.perf_counter()
+    print(f"✔ Indexed {len(verses)} verses, {len(index)} terms in {(t1 - t0) * 1000:.1f} ms")
+
+    query = " ".join(sys.argv[1:]) or "शांति"
+    t0 = time.perf_counter()
+    hits = index.search(query)
+    t1 = time.perf_counter()
+    print(f"🔎 '{query}': {len(hits)} hits in {(t1 - t0) * 1000:.2f} ms")
+    for i, score in hits:
+        v = verses[i]
+        print(f"  {score:6.2f}  {v.chapter}.{v.verse}  {v.problem}")
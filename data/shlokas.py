@@ -17,12 +17,28 @@ in environments where some SECTION modules are missing).
 
 If you want stricter behaviour (fail fast when a section is missing), replace the
 `warn_only=True` to `False` in the loader call below.
+
+Cold starts read the compiled snapshot (see data/snapshot.py) instead of
+importing the modules. The imports above are only used when the snapshot is
+missing or stale, and a fresh snapshot is written afterwards.
+
+Sections are resolved lazily: ALL_SHLOKAS, LOADED_SECTIONS and FAILED_SECTIONS
+keep their names, but a section is only decoded (or imported) when its data is
+first accessed. Use section_titles() for a cheap first screen, then
+data.verses.iter_flatten() to fill in the verses section by section.
 """
 
+from collections.abc import Mapping, Sequence
 from importlib import import_module
 import sys
+import threading
 import types
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    from data.snapshot import SnapshotError, load_snapshot, write_snapshot
+except ModuleNotFoundError:
+    from snapshot import SnapshotError, load_snapshot, write_snapshot
 
 
 def try_import_section(module_basename: str, expected_attr: str, warn_only: bool = True) -> Tuple[str, Any]:
@@ -64,6 +80,7 @@ def try_import_section(module_basename: str, expected_attr: str, warn_only: bool
         # Fallback: look for any attribute starting with 'section_'
         for name in dir(mod):
             if name.startswith('section_'):
+                print(f"⚠️ Warning: '{modpath}' has no '{expected_attr}', using '{name}' instead")
                 return modpath, getattr(mod, name)
 
         # No suitable attribute found
@@ -99,25 +116,198 @@ SECTION_MAP = {
     'SECTION_16': 'section_16',
 }
 
-LOADED_SECTIONS: Dict[str, Any] = {}
-FAILED_SECTIONS: List[str] = []
+class SectionRegistry:
+    """
+    Resolves SECTION data on first access instead of at import time.
 
-for mod_basename, attr_name in SECTION_MAP.items():
-    modpath, value = try_import_section(mod_basename, attr_name, warn_only=True)
-    if modpath is None or value is None:
-        FAILED_SECTIONS.append(mod_basename)
-    else:
-        LOADED_SECTIONS[mod_basename] = value
+    Sections come from the compiled snapshot when it is up to date, otherwise
+    from the SECTION modules. Nothing is decoded or imported until a section
+    is asked for.
+    """
+
+    def __init__(self, section_map: Dict[str, str]):
+        self.section_map = section_map
+        self.failed: List[str] = []
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._snapshot = load_snapshot(section_map)
+        self._snapshot_written = False
+        if self._snapshot is not None:
+            present = set(self._snapshot.section_names())
+            self._candidates = [m for m in section_map if m in present]
+            self.failed.extend(m for m in section_map if m not in present)
+        else:
+            self._candidates = list(section_map)
+
+    @property
+    def from_snapshot(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def validated(self) -> bool:
+        """True when the data comes from a snapshot that passed data/validate.py."""
+        return self._snapshot is not None and self._snapshot.validated
+
+    def names(self) -> List[str]:
+        """Basenames of sections that are (or may still turn out to be) available."""
+        return [m for m in self._candidates if m not in self.failed]
+
+    def is_loaded(self, mod_basename: str) -> bool:
+        return mod_basename in self._loaded
+
+    def get(self, mod_basename: str) -> Any:
+        """Return the section data, loading it on first use. None if unavailable."""
+        value = self._loaded.get(mod_basename)
+        if value is not None or mod_basename in self.failed:
+            return value
+        with self._lock:
+            if mod_basename in self._loaded or mod_basename in self.failed:
+                return self._loaded.get(mod_basename)
+            if mod_basename not in self.section_map:
+                raise KeyError(mod_basename)
+            if self._snapshot is not None:
+                value = self._snapshot.decode_section(mod_basename)
+            else:
+                modpath, value = try_import_section(
+                    mod_basename, self.section_map[mod_basename], warn_only=True
+                )
+            if value is None:
+                self.failed.append(mod_basename)
+            else:
+                self._loaded[mod_basename] = value
+            if self._all_resolved():
+                self._release_snapshot()
+                self._maybe_write_snapshot()
+            return value
+
+    def titles(self, mod_basename: str) -> List[str]:
+        """Problem titles of a section, without decoding its verses when possible."""
+        if self._snapshot is not None and not self.is_loaded(mod_basename):
+            if mod_basename in self.failed:
+                return []
+            return self._snapshot.problem_titles(mod_basename)
+        value = self.get(mod_basename)
+        return list(value) if isinstance(value, dict) else []
+
+    def load_all(self) -> Dict[str, Any]:
+        for mod_basename in list(self._candidates):
+            self.get(mod_basename)
+        return {m: self._loaded[m] for m in self._candidates if m in self._loaded}
+
+    def _all_resolved(self) -> bool:
+        return len(self._loaded) + len(self.failed) >= len(self._candidates)
+
+    def _release_snapshot(self) -> None:
+        # Every section is decoded: unmap the file so it can be rewritten.
+        if self._snapshot is not None:
+            self._snapshot.close()
+
+    def _maybe_write_snapshot(self) -> None:
+        # After the slow import path has seen every section, compile a snapshot
+        # so the next start can skip the module imports entirely.
+        if self._snapshot is not None or self._snapshot_written:
+            return
+        self._snapshot_written = True
+        try:
+            try:
+                from data.validate import errors, report, validate_corpus
+            except ModuleNotFoundError:
+                from validate import errors, report, validate_corpus
+            # Validated once here (cached by source hash) so later starts can
+            # trust the snapshot without checking anything.
+            issues = validate_corpus(self._loaded, self.section_map)
+            report(errors(issues))
+            write_snapshot(self._loaded, self.section_map, validated=not errors(issues))
+        except (OSError, SnapshotError) as e:
+            print(f"⚠️ Warning: could not write corpus snapshot — {e}")
+
+
+class LazySections(Mapping):
+    """Read-only mapping of basename -> section data, loaded on access."""
+
+    def __init__(self, registry: SectionRegistry):
+        self._registry = registry
 
-# Build ALL_SHLOKAS list in the expected order. Keep missing entries out but note them.
-ALL_SHLOKAS: List[Any] = []
-for mod_basename in SECTION_MAP.keys():
-    if mod_basename in LOADED_SECTIONS:
-        ALL_SHLOKAS.append(LOADED_SECTIONS[mod_basename])
+    @property
+    def validated(self) -> bool:
+        return self._registry.validated
+
+    def __getitem__(self, mod_basename: str) -> Any:
+        value = self._registry.get(mod_basename)
+        if value is None:
+            raise KeyError(mod_basename)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        # On the import path a section is only known to exist once imported,
+        # so iteration resolves each section as it goes.
+        for mod_basename in self._registry.names():
+            if self._registry.from_snapshot or self._registry.get(mod_basename) is not None:
+                yield mod_basename
+
+    def __len__(self) -> int:
+        if not self._registry.from_snapshot:
+            self._registry.load_all()
+        return len(self._registry.names())
+
+    def __contains__(self, mod_basename: object) -> bool:
+        return isinstance(mod_basename, str) and mod_basename in self._registry.names() \
+            and (self._registry.from_snapshot or self._registry.get(mod_basename) is not None)
+
+    def __repr__(self) -> str:
+        return f"<LazySections {list(self)}>"
+
+
+class LazySectionList(Sequence):
+    """Ordered, read-only list view of the available sections (ALL_SHLOKAS)."""
+
+    def __init__(self, sections: LazySections):
+        self._sections = sections
+        self._names: Optional[List[str]] = None
+
+    def __getitem__(self, i):
+        # Listing the sections resolves all of them on the import path, so the
+        # names are final once listed.
+        if self._names is None:
+            self._names = list(self._sections)
+        names = self._names
+        if isinstance(i, slice):
+            return [self._sections[m] for m in names[i]]
+        return self._sections[names[i]]
+
+    def __iter__(self) -> Iterator[Any]:
+        for mod_basename in self._sections:
+            yield self._sections[mod_basename]
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __repr__(self) -> str:
+        return f"<LazySectionList of {len(self)} sections>"
+
+
+REGISTRY = SectionRegistry(SECTION_MAP)
+
+# Filled as sections are resolved; complete after load_all_sections().
+FAILED_SECTIONS: List[str] = REGISTRY.failed
+LOADED_SECTIONS = LazySections(REGISTRY)
+
+# ALL_SHLOKAS keeps SECTION_MAP order and leaves missing entries out.
+ALL_SHLOKAS = LazySectionList(LOADED_SECTIONS)
 
 # Backward compatibility alias
 PROBLEM_SECTIONS = ALL_SHLOKAS
 
+
+def section_titles() -> List[Tuple[str, List[str]]]:
+    """(basename, problem titles) for every section — enough for a first screen."""
+    return [(m, REGISTRY.titles(m)) for m in REGISTRY.names()]
+
+
+def load_all_sections() -> Dict[str, Any]:
+    return REGISTRY.load_all()
+
+
 if __name__ == '__main__':
     print("🔢 Current Sections Loaded:", len(ALL_SHLOKAS))
     if FAILED_SECTIONS:
@@ -143,4 +333,5 @@ if __name__ == '__main__':
         print("No sections available to introspect. Create the SECTION_X modules or adjust the loader.")
 
 # Exports for external use
-__all__ = ['ALL_SHLOKAS', 'PROBLEM_SECTIONS', 'LOADED_SECTIONS', 'FAILED_SECTIONS']
+__all__ = ['ALL_SHLOKAS', 'PROBLEM_SECTIONS', 'LOADED_SECTIONS', 'FAILED_SECTIONS',
+           'section_titles', 'load_all_sections']
@@ -0,0 +1,366 @@
+# data/snapshot.py
+"""
+Compiled binary snapshot of all SECTION modules.
+
+Importing 16 SECTION_* modules on every start is the slowest part of a cold
+launch on low-end devices. This module compiles the loaded sections into a
+single versioned file that can be memory-mapped and decoded without importing
+any of them.
+
+File layout (all integers little-endian):
+
+    header      MAGIC, FORMAT_VERSION, flags (FLAG_VALIDATED), source
+                fingerprint (sha256), source stat stamp (sha256),
+                section / problem / verse / string counts
+    sections    one fixed-width record per SECTION module
+    problems    one fixed-width record per problem title (dict key)
+    verses      one fixed-width record per verse dict (verse ranges such as
+                "13-14" are stored as a start/end pair)
+    offsets     string_count + 1 offsets into the string blob
+    strings     UTF-8 string blob (every distinct string stored once)
+
+The fingerprint is a hash of SECTION_MAP and the source bytes of every
+SECTION file; the stat stamp hashes their sizes and mtimes instead. A start
+only stats the sources: when the stamp matches, the snapshot is fresh without
+reading any of them, and only a mismatch (an edit, or a checkout that touched
+the files) falls back to comparing the fingerprint. When the fingerprint
+still matches, the new stamp is written into the header so the next start
+is stat-only again. A snapshot whose fingerprint does not match is stale and the loader falls back to the Python
+modules. When none of the source files are present (packaged builds) the
+snapshot is trusted as-is.
+
+The mapping is closed once every section has been decoded (Snapshot.close),
+so the file can be rewritten in place, also on Windows.
+
+Build it explicitly with:
+
+    python -m data.snapshot
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "shlokas.snap")
+
+MAGIC = b"GITASNAP"
+FORMAT_VERSION = 2
+
+# Fields of a verse dict, in record order. Snapshots only round-trip these.
+INT_FIELDS = ("id", "chapter", "verse")
+STR_FIELDS = ("sanskrit", "hindi_arth", "saral_samajh", "udaharan")
+VERSE_FIELDS = INT_FIELDS + STR_FIELDS
+
+_HEADER = struct.Struct("<8sHH32s32sIIII")
+_STAT_STAMP_OFFSET = struct.calcsize("<8sHH32s")
+_SECTION = struct.Struct("<IIII")       # name, attr, first problem, problem count
+_PROBLEM = struct.Struct("<III")        # title, first verse, verse count
+_VERSE = struct.Struct("<iHHHH" + "I" * len(STR_FIELDS))   # id, chapter, verse start/end, flags, strings
+_VERSE_IS_STR = 0x1     # verse was written as a string ("47" or "13-14")
+FLAG_VALIDATED = 0x1    # header flag: data passed data/validate.py when written
+_OFFSET = struct.Struct("<I")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is corrupt or cannot represent the data."""
+
+
+def pack_verse_number(value: Any) -> Tuple[int, int, int]:
+    """Encode an int verse or a "13-14" style range as (start, end, flags)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value, value, 0
+    if isinstance(value, str):
+        start, sep, end = value.partition("-")
+        if start.isdigit() and (not sep or end.isdigit()):
+            return int(start), int(end or start), _VERSE_IS_STR
+    raise SnapshotError(f"unsupported verse number {value!r}")
+
+
+def unpack_verse_number(start: int, end: int, flags: int) -> Any:
+    if not flags & _VERSE_IS_STR:
+        return start
+    return str(start) if start == end else f"{start}-{end}"
+
+
+def section_source_path(mod_basename: str) -> str:
+    return os.path.join(DATA_DIR, f"{mod_basename}.py")
+
+
+def source_fingerprint(section_map: Dict[str, str]) -> Optional[bytes]:
+    """
+    Hash SECTION_MAP and the bytes of every SECTION source file.
+
+    Returns None if none of the source files exist (e.g. a packaged build
+    that only ships the snapshot).
+    """
+    h = hashlib.sha256()
+    found = False
+    for mod_basename, attr_name in section_map.items():
+        h.update(f"{mod_basename}={attr_name}\0".encode("utf-8"))
+        try:
+            with open(section_source_path(mod_basename), "rb") as f:
+                h.update(f.read())
+            found = True
+        except OSError:
+            h.update(b"<missing>")
+        h.update(b"\0")
+    return h.digest() if found else None
+
+
+def source_stat_stamp(section_map: Dict[str, str]) -> Optional[bytes]:
+    """
+    Hash SECTION_MAP and the size and mtime of every SECTION source file:
+    a freshness check that stats the files without opening them.
+
+    Returns None if none of the source files exist.
+    """
+    h = hashlib.sha256()
+    found = False
+    for mod_basename, attr_name in section_map.items():
+        try:
+            st = os.stat(section_source_path(mod_basename))
+            stat = f"{st.st_size}:{st.st_mtime_ns}"
+            found = True
+        except OSError:
+            stat = "<missing>"
+        h.update(f"{mod_basename}={attr_name}:{stat}\0".encode("utf-8"))
+    return h.digest() if found else None
+
+
+# ------------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------------
+def build_snapshot(loaded_sections: Dict[str, Any], section_map: Dict[str, str],
+                   validated: bool = False) -> bytes:
+    """
+    Serialise loaded sections (basename -> {problem title: [verse dicts]}) into
+    snapshot bytes. Raises SnapshotError if the data does not fit the format.
+    `validated` marks data that passed the schema check.
+    """
+    strings: List[bytes] = []
+    string_ids: Dict[str, int] = {}
+
+    def sid(value: str) -> int:
+        if not isinstance(value, str):
+            raise SnapshotError(f"expected str, got {type(value).__name__}")
+        idx = string_ids.get(value)
+        if idx is None:
+            idx = string_ids[value] = len(strings)
+            strings.append(value.encode("utf-8"))
+        return idx
+
+    section_recs, problem_recs, verse_recs = [], [], []
+    for mod_basename, attr_name in section_map.items():
+        sec = loaded_sections.get(mod_basename)
+        if sec is None:
+            continue
+        if not isinstance(sec, dict):
+            raise SnapshotError(f"{mod_basename}: section is not a dict")
+        section_recs.append((sid(mod_basename), sid(attr_name), len(problem_recs), len(sec)))
+        for title, verses in sec.items():
+            problem_recs.append((sid(title), len(verse_recs), len(verses)))
+            for v in verses:
+                if set(v) != set(VERSE_FIELDS):
+                    raise SnapshotError(f"{mod_basename}: unexpected verse keys {sorted(v)}")
+                if not isinstance(v["id"], int) or not isinstance(v["chapter"], int):
+                    raise SnapshotError(f"{mod_basename}: id/chapter must be ints")
+                verse_recs.append(
+                    (v["id"], v["chapter"]) + pack_verse_number(v["verse"])
+                    + tuple(sid(v[k]) for k in STR_FIELDS)
+                )
+
+    fingerprint = source_fingerprint(section_map) or b"\0" * 32
+    stat_stamp = source_stat_stamp(section_map) or b"\0" * 32
+    out = bytearray(_HEADER.pack(
+        MAGIC, FORMAT_VERSION, FLAG_VALIDATED if validated else 0, fingerprint, stat_stamp,
+        len(section_recs), len(problem_recs), len(verse_recs), len(strings),
+    ))
+    try:
+        for rec in section_recs:
+            out += _SECTION.pack(*rec)
+        for rec in problem_recs:
+            out += _PROBLEM.pack(*rec)
+        for rec in verse_recs:
+            out += _VERSE.pack(*rec)
+    except struct.error as e:
+        raise SnapshotError(str(e)) from e
+
+    pos = 0
+    for s in strings:
+        out += _OFFSET.pack(pos)
+        pos += len(s)
+    out += _OFFSET.pack(pos)
+    for s in strings:
+        out += s
+    return bytes(out)
+
+
+def write_stat_stamp(stamp: bytes, path: str = SNAPSHOT_PATH) -> None:
+    """Replace the stat stamp in a snapshot's header, leaving the rest as is."""
+    with open(path, "r+b") as f:
+        f.seek(_STAT_STAMP_OFFSET)
+        f.write(stamp)
+
+
+def write_snapshot(loaded_sections: Dict[str, Any], section_map: Dict[str, str],
+                   path: str = SNAPSHOT_PATH, validated: bool = False) -> str:
+    """Build and atomically write a snapshot file. Returns the path written."""
+    blob = build_snapshot(loaded_sections, section_map, validated)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return path
+
+
+# ------------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------------
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, buf):
+        self._buf = buf
+        try:
+            (magic, version, self.flags, self.fingerprint, self.stat_stamp,
+             n_sec, n_prob, n_verse, n_str) = _HEADER.unpack_from(buf, 0)
+        except struct.error as e:
+            raise SnapshotError("truncated header") from e
+        if magic != MAGIC:
+            raise SnapshotError("bad magic")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"unsupported format version {version}")
+
+        self._sec_off = _HEADER.size
+        self._prob_off = self._sec_off + n_sec * _SECTION.size
+        self._verse_off = self._prob_off + n_prob * _PROBLEM.size
+        self._str_tab = self._verse_off + n_verse * _VERSE.size
+        self._str_blob = self._str_tab + (n_str + 1) * _OFFSET.size
+        self.section_count = n_sec
+        self.verse_count = n_verse
+        self._string_count = n_str
+        self._strings: Dict[int, str] = {}
+
+        if len(buf) < self._str_blob:
+            raise SnapshotError("truncated tables")
+        (blob_len,) = _OFFSET.unpack_from(buf, self._str_blob - _OFFSET.size)
+        if len(buf) != self._str_blob + blob_len:
+            raise SnapshotError("string blob size mismatch")
+
+        self._index: Dict[str, Tuple[str, int, int]] = {}
+        for i in range(n_sec):
+            name, attr, first, count = _SECTION.unpack_from(buf, self._sec_off + i * _SECTION.size)
+            self._index[self.string(name)] = (self.string(attr), first, count)
+
+    @property
+    def validated(self) -> bool:
+        return bool(self.flags & FLAG_VALIDATED)
+
+    def close(self) -> None:
+        """Release the mapping; header fields stay readable, sections do not."""
+        if self._buf is not None and hasattr(self._buf, "close"):
+            self._buf.close()
+        self._buf = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def string(self, idx: int) -> str:
+        s = self._strings.get(idx)
+        if s is None:
+            if not 0 <= idx < self._string_count:
+                raise SnapshotError(f"string index {idx} out of range")
+            start, end = struct.unpack_from("<II", self._buf, self._str_tab + idx * _OFFSET.size)
+            s = self._strings[idx] = str(self._buf[self._str_blob + start:self._str_blob + end], "utf-8")
+        return s
+
+    def section_names(self) -> List[str]:
+        return list(self._index)
+
+    def problem_titles(self, mod_basename: str) -> List[str]:
+        """Problem titles of one section, without decoding any verse."""
+        _, first, count = self._index[mod_basename]
+        return [
+            self.string(_PROBLEM.unpack_from(self._buf, self._prob_off + p * _PROBLEM.size)[0])
+            for p in range(first, first + count)
+        ]
+
+    def decode_section(self, mod_basename: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Rebuild the {problem title: [verse dicts]} mapping for one section."""
+        _, first, count = self._index[mod_basename]
+        section: Dict[str, List[Dict[str, Any]]] = {}
+        for p in range(first, first + count):
+            title, v_first, v_count = _PROBLEM.unpack_from(self._buf, self._prob_off + p * _PROBLEM.size)
+            verses = []
+            for v in range(v_first, v_first + v_count):
+                rec = _VERSE.unpack_from(self._buf, self._verse_off + v * _VERSE.size)
+                d = {"id": rec[0], "chapter": rec[1], "verse": unpack_verse_number(*rec[2:5])}
+                for k, s in zip(STR_FIELDS, rec[5:]):
+                    d[k] = self.string(s)
+                verses.append(d)
+            section[self.string(title)] = verses
+        return section
+
+
+def open_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Snapshot]:
+    """Memory-map a snapshot file. Returns None if it is missing or empty."""
+    try:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return Snapshot(buf)
+    except SnapshotError:
+        buf.close()
+        raise
+
+
+def load_snapshot(section_map: Dict[str, str], path: str = SNAPSHOT_PATH) -> Optional[Snapshot]:
+    """
+    Open the snapshot if it is present, readable and matches the current
+    sources. Returns None when the caller should fall back to module imports.
+    """
+    try:
+        snap = open_snapshot(path)
+    except SnapshotError as e:
+        print(f"⚠️ Warning: ignoring corrupt snapshot {path} — {e}")
+        return None
+    if snap is None:
+        return None
+    stamp = source_stat_stamp(section_map)
+    if stamp is None or stamp == snap.stat_stamp:
+        return snap
+    if source_fingerprint(section_map) != snap.fingerprint:
+        snap.close()
+        return None
+    # Same sources with new mtimes (a checkout, touch or copied tree): record
+    # the stamp so later starts skip the fingerprint. The mapping is closed
+    # first so the header can be written on Windows too.
+    snap.close()
+    try:
+        write_stat_stamp(stamp, path)
+    except OSError as e:
+        print(f"⚠️ Warning: could not update snapshot stamp — {e}")
+    try:
+        return open_snapshot(path)
+    except SnapshotError:
+        return None
+
+
+if __name__ == "__main__":
+    from data.shlokas import SECTION_MAP, load_all_sections
+    from data.validate import errors, report, validate_corpus
+
+    loaded = load_all_sections()
+    issues = validate_corpus(loaded, SECTION_MAP)
+    report(issues)
+    out = write_snapshot(loaded, SECTION_MAP, validated=not errors(issues))
+    state = "validated" if not errors(issues) else f"NOT validated, {len(errors(issues))} errors"
+    print(f"✔ Snapshot written: {out} ({os.path.getsize(out)} bytes, {len(loaded)} sections, {state})")
@@ -0,0 +1,98 @@
+# data/speech.py
+"""
+Short text-to-speech segments for the verse text.
+
+A TTS engine synthesises a whole utterance before it makes a sound, so the
+page speaks a verse as a queue of short segments rather than one block.
+Text is normalised and split here, at build time:
+
+ - verse numbers between dandas (॥१५॥) are dropped
+ - emoji and other symbols are stripped; bullets and slashes become pauses
+ - text is split after a danda (।, ॥) or a sentence end (. ! ?), and
+   sentences longer than MAX_SEGMENT characters again after commas
+ - whitespace is collapsed; segments with nothing to pronounce are dropped
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Tuple
+
+MAX_SEGMENT = 160
+
+_VERSE_NUMBER_RE = re.compile("\u0965\\s*[\\d\u0966-\u096f.\\-]+\\s*\u0965")
+_PAUSE_RE = re.compile(r"\s*[•·/|]\s*")
+# ZWJ left behind by an emoji sequence; inside Devanagari it shapes conjuncts.
+_STRAY_ZWJ_RE = re.compile("(?<![\u0900-\u097f])\u200d|\u200d(?![\u0900-\u097f])")
+# After a danda; after . ! ? that follow a word (so "1. " and "15.15" stay).
+_SENTENCE_RE = re.compile("(?<=[\u0964\u0965])\\s*|(?<=[^\\d\\s.][.!?])\\s+|\\n+")
+_CLAUSE_RE = re.compile(r"(?<=[,;:])\s+")
+_SPACE_RE = re.compile(r"\s+")
+_SPOKEN_RE = re.compile("[\\w\u0900-\u0963\u0966-\u097f]")
+
+# Stripped outright: emoji and pictographs (So), modifiers (Sk), arrows and
+# other math symbols (Sm), variation selectors and private-use characters.
+# Only characters outside words, spaces and common punctuation are checked.
+_STRIP_CATEGORIES = {"So", "Sk", "Sm", "Co", "Cs"}
+_STRIP_CHARS = {"\ufe0e", "\ufe0f", "\u20e3"}
+_SYMBOL_RE = re.compile("[^\\w\\s\u0900-\u097f.,;:!?'\"()\\-\u2010-\u2027]")
+
+
+def _strip_symbol(m) -> str:
+    c = m.group()
+    return "" if c in _STRIP_CHARS or unicodedata.category(c) in _STRIP_CATEGORIES else c
+
+
+def normalise(text: str) -> str:
+    text = _VERSE_NUMBER_RE.sub("\u0965", text)
+    text = _SYMBOL_RE.sub(_strip_symbol, text)
+    text = _STRAY_ZWJ_RE.sub("", text)
+    return _PAUSE_RE.sub(", ", text)
+
+
+def _pack(clauses: List[str], limit: int) -> List[str]:
+    # Greedily joins clauses back together up to `limit` characters.
+    out: List[str] = []
+    for clause in clauses:
+        if out and len(out[-1]) + 1 + len(clause) <= limit:
+            out[-1] += " " + clause
+        else:
+            out.append(clause)
+    return out
+
+
+def segments(text, limit: int = MAX_SEGMENT) -> List[str]:
+    """Speech segments for one text field, in reading order."""
+    if not text:
+        return []
+    return list(_segments(str(text), limit))
+
+
+# Titles, references and shared verse text repeat across many records.
+@lru_cache(maxsize=8192)
+def _segments(text: str, limit: int) -> Tuple[str, ...]:
+    out: List[str] = []
+    for sentence in _SENTENCE_RE.split(normalise(text)):
+        sentence = _SPACE_RE.sub(" ", sentence).strip(" ,")
+        if not _SPOKEN_RE.search(sentence):
+            continue
+        if len(sentence) > limit:
+            out += _pack(_CLAUSE_RE.split(sentence), limit)
+        else:
+            out.append(sentence)
+    return tuple(out)
+
+
+__all__ = ["segments", "normalise", "MAX_SEGMENT"]
+
+
+if __name__ == "__main__":
+    import sys
+    from data.verses import flatten
+
+    verses = flatten()
+    for v in verses[: int(sys.argv[1]) if len(sys.argv) > 1 else 1]:
+        for field in ("problem", "reference", "text", "meaning", "example"):
+            for seg in segments(getattr(v, field)):
+                print(f"{field:<10} {seg}")
+        print()
@@ -0,0 +1,242 @@
+# data/validate.py
+"""
+Schema and sanity checks for the SECTION data.
+
+Checks every section is {problem title: [verse dict, ...]} and every verse has:
+
+ - the required fields with the right types (id and chapter ints, verse an
+   int or an "a-b" range, text fields strings)
+ - a corpus-wide unique id
+ - a chapter in 1..18 and verse numbers within that chapter
+ - Sanskrit that is non-empty and actually Devanagari, and text fields free
+   of U+FFFD / mis-decoded UTF-8
+ - the same Sanskrit as every other citation of the same chapter.verse
+
+This runs at build time (snapshot and HTML generation), not at startup. The
+result is cached by the source fingerprint (see data/snapshot.py) and the
+bytes of the checker itself, so an unchanged corpus is only ever checked
+once and an edited rule is never answered from the cache. A snapshot
+written from a clean corpus is flagged as validated and loaded without
+further checks.
+
+    python -m data.validate
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    from data.snapshot import DATA_DIR, INT_FIELDS, STR_FIELDS, pack_verse_number, source_fingerprint
+except ModuleNotFoundError:
+    from snapshot import DATA_DIR, INT_FIELDS, STR_FIELDS, pack_verse_number, source_fingerprint
+
+VALIDATOR_VERSION = 1
+CACHE_PATH = os.path.join(DATA_DIR, ".validation_cache.json")
+
+# Verses per chapter. Chapter 13 allows 35 for editions that number
+# Arjuna's opening question as 13.1.
+VERSES_PER_CHAPTER = (47, 72, 43, 42, 29, 47, 30, 28, 34, 42, 55, 20, 35, 27, 20, 24, 28, 78)
+
+REQUIRED_TEXT = ("sanskrit", "hindi_arth")
+MIN_DEVANAGARI_RATIO = 0.8
+
+_DEVANAGARI_RE = re.compile("[\u0900-\u097f]")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+# UTF-8 Devanagari read as Latin-1 / cp1252 starts with "à¤" or "à¥".
+_MOJIBAKE_RE = re.compile("\u00e0[\u00a4\u00a5]")
+_CONTROL_RE = re.compile("[\x00-\x08\x0b-\x1f\x7f]")
+
+
+class Issue(NamedTuple):
+    severity: str       # "error" or "warning"
+    section: str
+    problem: str
+    id: Any
+    message: str
+
+    def __str__(self) -> str:
+        where = " / ".join(str(p) for p in (self.section, self.problem) if p)
+        if self.id is not None:
+            where += f" #{self.id}"
+        return f"{where}: {self.message}"
+
+
+def devanagari_ratio(text: str) -> float:
+    letters = _LETTER_RE.findall(text)
+    if not letters:
+        return 0.0
+    return sum(1 for c in letters if _DEVANAGARI_RE.match(c)) / len(letters)
+
+
+def _check_text(issues, where, field, value) -> None:
+    if "\ufffd" in value:
+        issues.append(Issue("error", *where, f"{field} contains U+FFFD replacement characters"))
+    if _MOJIBAKE_RE.search(value):
+        issues.append(Issue("error", *where, f"{field} looks like mis-decoded UTF-8"))
+    if _CONTROL_RE.search(value):
+        issues.append(Issue("error", *where, f"{field} contains control characters"))
+
+
+def validate_verse(v: Any, where, issues: List[Issue]) -> None:
+    if not isinstance(v, dict):
+        issues.append(Issue("error", *where, f"verse is {type(v).__name__}, not a dict"))
+        return
+    missing = [k for k in INT_FIELDS + STR_FIELDS if k not in v]
+    if missing:
+        issues.append(Issue("error", *where, f"missing fields {missing}"))
+    extra = sorted(set(v) - set(INT_FIELDS + STR_FIELDS))
+    if extra:
+        issues.append(Issue("error", *where, f"unexpected fields {extra}"))
+
+    for k in ("id", "chapter"):
+        if k in v and (not isinstance(v[k], int) or isinstance(v[k], bool)):
+            issues.append(Issue("error", *where, f"{k} must be an int, got {v[k]!r}"))
+
+    chapter = v.get("chapter")
+    if isinstance(chapter, int) and not 1 <= chapter <= len(VERSES_PER_CHAPTER):
+        issues.append(Issue("error", *where, f"chapter {chapter} out of range 1..{len(VERSES_PER_CHAPTER)}"))
+        chapter = None
+    if "verse" in v:
+        try:
+            start, end, _ = pack_verse_number(v["verse"])
+        except ValueError:
+            issues.append(Issue("error", *where, f"verse must be an int or 'a-b' range, got {v['verse']!r}"))
+        else:
+            if start < 1 or end < start:
+                issues.append(Issue("error", *where, f"bad verse range {v['verse']!r}"))
+            elif isinstance(chapter, int) and end > VERSES_PER_CHAPTER[chapter - 1]:
+                issues.append(Issue(
+                    "error", *where,
+                    f"verse {v['verse']} out of range, chapter {chapter} has {VERSES_PER_CHAPTER[chapter - 1]}",
+                ))
+
+    for k in STR_FIELDS:
+        value = v.get(k)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            issues.append(Issue("error", *where, f"{k} must be a string"))
+            continue
+        _check_text(issues, where, k, value)
+        if not value.strip():
+            severity = "error" if k in REQUIRED_TEXT else "warning"
+            issues.append(Issue(severity, *where, f"{k} is empty"))
+
+    sanskrit = v.get("sanskrit")
+    if isinstance(sanskrit, str) and sanskrit.strip():
+        ratio = devanagari_ratio(sanskrit)
+        if ratio < MIN_DEVANAGARI_RATIO:
+            issues.append(Issue("error", *where, f"sanskrit is only {ratio:.0%} Devanagari"))
+    meaning = v.get("hindi_arth")
+    if isinstance(meaning, str) and meaning.strip() and not _DEVANAGARI_RE.search(meaning):
+        issues.append(Issue("warning", *where, "hindi_arth has no Devanagari text"))
+
+
+def validate_sections(loaded_sections: Dict[str, Any]) -> List[Issue]:
+    """Check loaded sections (basename -> {problem title: [verse dicts]}). Returns all issues."""
+    issues: List[Issue] = []
+    ids: Dict[Any, str] = {}
+    texts: Dict[str, Any] = {}
+    for mod_basename, sec in loaded_sections.items():
+        if not isinstance(sec, dict):
+            issues.append(Issue("error", mod_basename, "", None, f"section is {type(sec).__name__}, not a dict"))
+            continue
+        if not sec:
+            issues.append(Issue("warning", mod_basename, "", None, "section has no problems"))
+        for title, verses in sec.items():
+            if not isinstance(title, str) or not title.strip():
+                issues.append(Issue("error", mod_basename, str(title), None, "problem title must be a non-empty string"))
+            if not isinstance(verses, list):
+                issues.append(Issue("error", mod_basename, str(title), None, "verses must be a list"))
+                continue
+            if not verses:
+                issues.append(Issue("warning", mod_basename, title, None, "problem has no verses"))
+            for v in verses:
+                vid = v.get("id") if isinstance(v, dict) else None
+                where = (mod_basename, title, vid)
+                validate_verse(v, where, issues)
+                if vid is None:
+                    continue
+                if vid in ids:
+                    issues.append(Issue("error", *where, f"duplicate id, also used in {ids[vid]}"))
+                else:
+                    ids[vid] = f"{mod_basename} / {title}"
+                key = f"{v.get('chapter')}.{v.get('verse')}"
+                first = texts.setdefault(key, v.get("sanskrit"))
+                if first != v.get("sanskrit"):
+                    issues.append(Issue("error", *where, f"{key} sanskrit differs from its first citation"))
+    return issues
+
+
+def validator_hash() -> str:
+    """Hash of this module and data/snapshot.py, whose rules decide the result."""
+    h = hashlib.sha256(str(VALIDATOR_VERSION).encode("ascii"))
+    for path in (os.path.abspath(__file__), os.path.join(DATA_DIR, "snapshot.py")):
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"<missing>")
+    return h.hexdigest()[:16]
+
+
+def errors(issues: List[Issue]) -> List[Issue]:
+    return [i for i in issues if i.severity == "error"]
+
+
+def _load_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def validate_corpus(loaded_sections: Dict[str, Any], section_map: Dict[str, str],
+                    cache_path: Optional[str] = CACHE_PATH) -> List[Issue]:
+    """
+    validate_sections(), cached by the source fingerprint: an unchanged corpus
+    returns the stored issues without looking at the data again.
+    """
+    fingerprint = source_fingerprint(section_map)
+    key = f"{validator_hash()}:{fingerprint.hex()}" if fingerprint is not None else None
+    if key is not None and cache_path:
+        cached = _load_cache(cache_path)
+        if cached.get("key") == key:
+            return [Issue(*i) for i in cached["issues"]]
+
+    issues = validate_sections(loaded_sections)
+    if key is not None and cache_path:
+        tmp = cache_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "issues": [list(i) for i in issues]}, f, ensure_ascii=False)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    return issues
+
+
+def report(issues: List[Issue], limit: int = 20) -> None:
+    for i in issues[:limit]:
+        mark = "❌" if i.severity == "error" else "⚠️"
+        print(f"{mark} {i}")
+    if len(issues) > limit:
+        print(f"   … and {len(issues) - limit} more")
+
+
+__all__ = ["Issue", "validate_sections", "validate_corpus", "errors", "report", "VERSES_PER_CHAPTER"]
+
+
+if __name__ == "__main__":
+    import sys
+    from data.shlokas import SECTION_MAP, load_all_sections
+
+    found = validate_corpus(load_all_sections(), SECTION_MAP, cache_path=None)
+    report(found, limit=len(found))
+    n_err = len(errors(found))
+    print(f"{'❌' if n_err else '✅'} {n_err} errors, {len(found) - n_err} warnings")
+    sys.exit(1 if n_err else 0)
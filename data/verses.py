@@ -0,0 +1,161 @@
+# data/verses.py
+"""
+Compact verse records shared by the Kivy app, the HTML generator and the
+exporters.
+
+The SECTION modules store verses as {problem title: [verse dict, ...]}. Every
+entry point used to build its own list of per-verse dicts from that shape;
+`flatten()` is now the single place that does it and returns `Verse` objects
+with __slots__, interned section/problem strings and the chapter/verse values
+kept as given (ints, or strings such as "13-14" for verse ranges).
+
+A Gita verse cited under several problems is stored once: every citation of
+the same chapter.verse key shares one Sanskrit string, and
+`canonical_texts()` gives the key -> text store the HTML page ships. The
+meaning, explanation and example stay with each citation because they are
+written per problem.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+PLACEHOLDER = "—"
+
+
+class Verse:
+    __slots__ = (
+        "id", "chapter", "verse", "section", "problem",
+        "sanskrit", "hindi_arth", "saral_samajh", "udaharan",
+    )
+
+    def __init__(self, id, chapter, verse, section, problem,
+                 sanskrit="", hindi_arth="", saral_samajh="", udaharan=""):
+        self.id = id
+        self.chapter = chapter
+        self.verse = verse
+        self.section = section          # SECTION module basename, e.g. "SECTION_1"
+        self.problem = problem          # problem title the verse is listed under
+        self.sanskrit = sanskrit
+        self.hindi_arth = hindi_arth
+        self.saral_samajh = saral_samajh
+        self.udaharan = udaharan
+
+    @classmethod
+    def from_dict(cls, d: dict, section: str = "", problem: str = "") -> "Verse":
+        return cls(
+            d.get("id"), d.get("chapter", ""), d.get("verse", ""),
+            section, problem,
+            d.get("sanskrit", ""), d.get("hindi_arth", ""),
+            d.get("saral_samajh", ""), d.get("udaharan", ""),
+        )
+
+    @property
+    def key(self) -> str:
+        """Canonical verse key, "chapter.verse" (e.g. "2.47", "12.13-14")."""
+        return verse_key(self.chapter, self.verse)
+
+    # Display helpers used by the UI, the HTML page and the exporters.
+    @property
+    def reference(self) -> str:
+        return f"अध्याय {self.chapter} • श्लोक {self.verse}"
+
+    @property
+    def text(self) -> str:
+        return self.sanskrit or PLACEHOLDER
+
+    @property
+    def meaning(self) -> str:
+        return self.hindi_arth or PLACEHOLDER
+
+    @property
+    def example(self) -> str:
+        return self.udaharan or PLACEHOLDER
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"<Verse {self.id} {self.chapter}.{self.verse} {self.section}>"
+
+
+def verse_key(chapter: Any, verse: Any) -> str:
+    return f"{chapter}.{verse}"
+
+
+def _iter_sections(sections: Any) -> Iterable[Tuple[str, Any]]:
+    # LOADED_SECTIONS-style mapping (basename -> section) or a plain iterable
+    # of section dicts such as ALL_SHLOKAS.
+    if isinstance(sections, Mapping):
+        return sections.items()
+    return (("", sec) for sec in sections)
+
+
+def flatten(sections: Optional[Any] = None) -> List[Verse]:
+    """
+    Flatten SECTION data into a list of Verse records, in corpus order.
+
+    `sections` defaults to data.shlokas.LOADED_SECTIONS; ALL_SHLOKAS or any
+    iterable of section dicts works too (the section basename is then empty).
+    """
+    result: List[Verse] = []
+    for _, verses in iter_flatten(sections):
+        result += verses
+    return result
+
+
+def iter_flatten(sections: Optional[Any] = None) -> Iterator[Tuple[str, List[Verse]]]:
+    """
+    flatten() one section at a time: yields (basename, verses) as each
+    section is resolved, so a lazy LOADED_SECTIONS is decoded progressively.
+    """
+    if sections is None:
+        from data.shlokas import LOADED_SECTIONS
+        sections = LOADED_SECTIONS
+
+    intern = sys.intern
+    # Data from a validated snapshot has every field in place: skip the
+    # per-verse defaults and shape checks.
+    trusted = getattr(sections, "validated", False)
+    texts: Dict[str, str] = {}
+    for basename, sec in _iter_sections(sections):
+        if not trusted:
+            if isinstance(sec, list) and sec:
+                sec = sec[0]
+            if not isinstance(sec, dict):
+                continue
+        basename = intern(basename)
+        result: List[Verse] = []
+        append = result.append
+        for title, shlok_list in sec.items():
+            title = intern(title)
+            for s in shlok_list:
+                if trusted:
+                    v = Verse(s["id"], s["chapter"], s["verse"], basename, title,
+                              s["sanskrit"], s["hindi_arth"], s["saral_samajh"], s["udaharan"])
+                else:
+                    v = Verse.from_dict(s, basename, title)
+                # Later citations of a verse reuse the first citation's text object.
+                canon = texts.setdefault(v.key, v.sanskrit)
+                if canon == v.sanskrit:
+                    v.sanskrit = canon
+                append(v)
+        yield basename, result
+
+
+def canonical_texts(verses: Iterable[Verse]) -> Tuple[Dict[str, str], List[Verse]]:
+    """
+    Key -> display text (Verse.text) for every distinct verse, first citation
+    first. Also returns the citations whose text differs from the canonical
+    one for their key; the generator reports those as data errors.
+    """
+    texts: Dict[str, str] = {}
+    conflicts: List[Verse] = []
+    for v in verses:
+        text = texts.setdefault(v.key, v.text)
+        if text != v.text:
+            conflicts.append(v)
+    return texts, conflicts
+
+
+__all__ = ["Verse", "flatten", "iter_flatten", "canonical_texts", "verse_key", "PLACEHOLDER"]
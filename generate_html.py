@@ -1,510 +1,717 @@
+"""
+Build the HTML reader pages from the SECTION data.
+
+    python generate_html.py [--variants variants.json] [--only android,desktop]
+                            [--jobs N] [--full] [--no-open]
+
+Each variant (see DEFAULT_VARIANTS) names an output path, verses per page,
+an optional template and a page-field -> Verse-attribute mapping. All
+variants share one flattened corpus and are built in a process pool.
+"""
+import filecmp
+import functools
+import hashlib
+import itertools
+import json
 import os
+import re
+import sys
 import webbrowser
-from data.shlokas import ALL_SHLOKAS
+from concurrent.futures import ProcessPoolExecutor
+from data.shlokas import LOADED_SECTIONS, REGISTRY, SECTION_MAP
+from data.snapshot import section_source_path
+from data.search import PREFIX_PENALTY, MAX_PREFIX_EXPANSION, build_index
+from data.speech import segments
+from data.lookup import build_lookup
+from data.validate import errors, report, validate_corpus
+from data.verses import canonical_texts, flatten
+from utils.minify import minify_html, precompress
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_HTML = os.path.join(
     BASE_DIR,
     "android", "app", "src", "main", "assets", "html", "gita_shlokas.html"
 )
+TEMPLATE_HTML = os.path.join(BASE_DIR, "templates", "gita_shlokas.html")
 
 SHLOKAS_PER_PAGE = 2
 
+# Page field -> Verse attribute. Variants may map e.g. "meaning" to "saral_samajh".
+DEFAULT_FIELDS = {
+    "section": "problem",
+    "problem": "problem",
+    "reference": "reference",
+    "text": "text",
+    "meaning": "meaning",
+    "example": "example",
+}
+
+# Outputs built by main(). "mode" is "chunked" (page + chunks/ directory) or
+# "single" (one self-contained file). "minify" shrinks the template,
+# "compact" ships verses as arrays instead of keyed objects, "precompress"
+# writes .gz/.br copies and "drop_plain_chunks" / "drop_plain_page" ship the
+# chunks / the page only in their precompressed form (MainActivity inflates
+# .gz assets on the fly).
+# Override with --variants <file.json>.
+DEFAULT_VARIANTS = [
+    {"name": "android", "output": OUTPUT_HTML, "per_page": SHLOKAS_PER_PAGE, "mode": "chunked",
+     "minify": True, "compact": True, "precompress": ["gz"], "drop_plain_chunks": True,
+     "drop_plain_page": True},
+    {"name": "desktop", "output": os.path.join(BASE_DIR, "build", "desktop", "index.html"),
+     "per_page": 5, "mode": "single"},
+]
+
+# Verse attributes stored once per chapter.verse key (see data/verses.py):
+# rows carry the key, and each chunk ships the texts of the keys its own rows
+# use, so a chunk is displayable as soon as it has loaded.
+CANONICAL_ATTRS = ("text",)
+
+# What the player reads for a verse, in order: (spoken label, page field).
+# Every row carries its speech as short segments (data/speech.py) in a
+# "speech" field; a canonical field contributes a null there, filled on the
+# page from the segments shipped with the chunk's canonical texts.
+SPEECH_FIELD = "speech"
+SPEECH_PARTS = (
+    ("अनुभाग:", "section"),
+    (None, "reference"),
+    ("संस्कृत:", "text"),
+    ("हिंदी अर्थ:", "meaning"),
+    ("उदाहरण:", "example"),
+)
+
+# Corpus chunks are written next to the page: <page dir>/chunks/<SECTION>.js.
+CHUNK_DIR = "chunks"
+SEARCH_CHUNK = "search_index.js"
+
+# Per-section build cache: escaped JSON fragments keyed by section content hash.
+CACHE_DIR = os.path.join(BASE_DIR, ".build_cache")
+CACHE_VERSION = 3
+
+# Modules whose code shapes the emitted JS: rows, search index, lookup,
+# speech segments and minification. Part of every cache key.
+GENERATOR_SOURCES = (
+    os.path.abspath(__file__),
+    os.path.join(BASE_DIR, "data", "verses.py"),
+    os.path.join(BASE_DIR, "data", "search.py"),
+    os.path.join(BASE_DIR, "data", "lookup.py"),
+    os.path.join(BASE_DIR, "data", "speech.py"),
+    os.path.join(BASE_DIR, "utils", "minify.py"),
+)
+
 
 def flatten_sections(all_sections):
-    flat = []
-    for sec in all_sections:
-        if not isinstance(sec, dict):
+    return flatten(all_sections)
+
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# JSON text -> body of a single-quoted JS string literal, in one regex pass
+# (str.translate walks every Devanagari character in Python). "<" is escaped
+# so an inline payload can never contain "</script>"; U+2028/2029 are line
+# terminators in older JS engines.
+_JS_STRING_ESCAPES = {"\\": "\\\\", "'": "\\'", "<": "\\x3c", "\u2028": "\\u2028", "\u2029": "\\u2029"}
+_JS_STRING_RE = re.compile("[\\\\'<\u2028\u2029]")
+
+
+def _js_string_escape(m):
+    return _JS_STRING_ESCAPES[m.group()]
+
+
+def iter_json(value):
+    """Compact JSON text for `value` (one piece: encode() runs in C, iterencode does not)."""
+    yield _JSON_ENCODER.encode(value)
+
+
+def js_json(value):
+    """`value` as JSON text escaped for a single-quoted JS string literal."""
+    return _JS_STRING_RE.sub(_js_string_escape, _JSON_ENCODER.encode(value))
+
+
+def iter_json_parse(string_pieces):
+    """
+    JSON.parse('...') around already escaped JSON text. The WebView scans a
+    string literal and parses it as JSON much faster than it runs the
+    equivalent object literals through the full JavaScript parser.
+    """
+    yield "JSON.parse('"
+    yield from string_pieces
+    yield "')"
+
+
+def speech_row(s, fields=None):
+    """Speech segments for verse `s` in SPEECH_PARTS order (None = canonical text)."""
+    fields = fields or DEFAULT_FIELDS
+    out = []
+    for label, field in SPEECH_PARTS:
+        attr = fields.get(field)
+        if attr is None:
             continue
-        for title, shlok_list in sec.items():
-            for s in shlok_list:
-                chapter = s.get("chapter", "")
-                verse = s.get("verse", "")
-
-                reference = f"अध्याय {chapter} • श्लोक {verse}"
-
-                flat.append({
-                    "section": title,
-                    "problem": title,
-                    "reference": reference,
-                    "text": s.get("sanskrit", "") or "—",
-                    "meaning": s.get("hindi_arth", "") or "—",
-                    "example": s.get("udaharan", "") or "—"
-                })
-    return flat
-
-
-def js_escape(t):
-    if t is None:
-        return ""
-    return (
-        str(t)
-        .replace("\\", "\\\\")
-        .replace("`", "\\`")
-        .replace("</", "<\\u002F")
-        .replace("\r", "")
+        if label:
+            out.append(label)
+        if attr in CANONICAL_ATTRS:
+            out.append(None)
+        else:
+            out += segments(getattr(s, attr))
+    return out
+
+
+def verse_rows(flat, fields=None, compact=False):
+    """
+    Page rows for `flat`, one at a time: {"id": .., field: value, "speech":
+    [...]} objects, or with compact=True bare [id, value, ..., speech]
+    arrays in `fields` order. Fields mapped to CANONICAL_ATTRS hold the
+    verse key instead of the text.
+    """
+    fields = fields or DEFAULT_FIELDS
+    attrs = [(key, "key" if attr in CANONICAL_ATTRS else attr) for key, attr in fields.items()]
+    for s in flat:
+        if compact:
+            yield [s.id] + [getattr(s, attr) or "" for _, attr in attrs] + [speech_row(s, fields)]
+            continue
+        row = {"id": s.id}
+        for key, attr in attrs:
+            row[key] = getattr(s, attr) or ""
+        row[SPEECH_FIELD] = speech_row(s, fields)
+        yield row
+
+
+def iter_js_array(flat, fields=None, compact=False, batch_size=1024):
+    """
+    The verse rows of `flat` as one JSON array escaped for a JS string
+    literal, encoded a batch of rows at a time; only one batch of rows is
+    ever built.
+    """
+    rows = verse_rows(flat, fields, compact)
+    yield "["
+    first = True
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        if not first:
+            yield ","
+        first = False
+        yield js_json(batch)[1:-1]
+    yield "]"
+
+
+def gen_js_array(flat, fields=None):
+    return "".join(iter_js_array(flat, fields))
+
+
+def iter_search_index(flat):
+    # token -> posting list, built once here so the page never scans verse text.
+    return [js_json(build_index(flat).to_compact())]
+
+
+def chunk_texts(verses, fields=None):
+    """{verse key: text} for the keys the rows of `verses` carry ({} if none do)."""
+    fields = fields or DEFAULT_FIELDS
+    if not any(attr in CANONICAL_ATTRS for attr in fields.values()):
+        return {}
+    texts, conflicts = canonical_texts(verses)
+    for v in conflicts:
+        print(f"⚠️ Warning: {v.section} / {v.problem}: {v.key} text differs from its first citation; "
+              "the first citation's text is used")
+    return texts
+
+
+# Chunk scripts hand their payload to the page as JSON.parse('...'); the
+# pieces passed in are already escaped (iter_js_array, iter_search_index).
+def iter_chunk_args(verses, fields=None, compact=False):
+    """
+    gitaChunk() arguments after the index: the rows, the canonical texts
+    they reference and those texts' speech segments.
+    """
+    texts = chunk_texts(verses, fields)
+    yield from iter_json_parse(iter_js_array(verses, fields, compact))
+    yield ", "
+    yield from iter_json_parse([js_json(texts)])
+    yield ", "
+    yield from iter_json_parse([js_json({key: segments(text) for key, text in texts.items()})])
+
+
+def iter_chunk(idx, arg_pieces):
+    yield f"gitaChunk({idx}, "
+    yield from arg_pieces
+    yield ");\n"
+
+
+def iter_search_chunk(search_pieces):
+    yield "gitaSearchIndex("
+    yield from iter_json_parse(search_pieces)
+    yield ");\n"
+
+
+# Template text split into [literal, name, literal, name, ...] on __NAME__.
+_PLACEHOLDER_RE = re.compile(r"__([A-Z_]+)__")
+_TEMPLATES = {}
+
+
+def load_template(path=None, minify=False):
+    path = path or TEMPLATE_HTML
+    parts = _TEMPLATES.get((path, minify))
+    if parts is None:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        if minify:
+            text = minify_html(text)
+        parts = _TEMPLATES[(path, minify)] = _PLACEHOLDER_RE.split(text)
+    return parts
+
+
+def iter_page(manifest, inline_chunks=(), inline_search=(), template=None, per_page=SHLOKAS_PER_PAGE,
+              minify=False):
+    """
+    Yield the page piece by piece: literal template text and placeholder
+    values are produced in order, never joined into one document string.
+    """
+    values = {
+        "PER_PAGE": str(per_page),
+        "MANIFEST": iter_json_parse([js_json(manifest)]),
+        "INLINE_CHUNKS": inline_chunks,
+        "INLINE_SEARCH": inline_search,
+        "PREFIX_PENALTY": str(PREFIX_PENALTY),
+        "MAX_PREFIX_EXPANSION": str(MAX_PREFIX_EXPANSION),
+    }
+    for i, part in enumerate(load_template(template, minify)):
+        if not i % 2:
+            yield part
+            continue
+        value = values[part]
+        if isinstance(value, str):
+            yield value
+        else:
+            yield from value
+
+
+def page_manifest(total, chunks, search, fields=None, compact=False, lookup=None):
+    manifest = {"total": total, "chunks": chunks, "search": search}
+    if compact:
+        manifest["fields"] = list(fields or DEFAULT_FIELDS) + [SPEECH_FIELD]
+    # page fields that carry a verse key, and where their text is stored
+    manifest["canonical"] = [k for k, attr in (fields or DEFAULT_FIELDS).items() if attr in CANONICAL_ATTRS]
+    if lookup is not None:
+        # chapter.verse / id -> verse index, for deep links and cross-references
+        manifest["lookup"] = lookup
+    return manifest
+
+
+def iter_single_file(flat, fields=None, template=None, per_page=SHLOKAS_PER_PAGE, search_pieces=None,
+                     minify=False, compact=False):
+    """Single self-contained page with every verse and the search index inline."""
+    manifest = page_manifest(len(flat), [{"src": None, "start": 0, "count": len(flat)}], None, fields, compact,
+                             build_lookup(flat).to_compact())
+    return iter_page(
+        manifest,
+        iter_chunk(0, iter_chunk_args(flat, fields, compact)),
+        iter_search_chunk(search_pieces if search_pieces is not None else iter_search_index(flat)),
+        template,
+        per_page,
+        minify,
     )
 
 
-def gen_js_array(flat):
-    entries = []
-    for i, s in enumerate(flat):
-        entries.append(
-            "        {\n"
-            f"            id: {i},\n"
-            f"            section: `{js_escape(s['section'])}`,\n"
-            f"            problem: `{js_escape(s['problem'])}`,\n"
-            f"            reference: `{js_escape(s['reference'])}`,\n"
-            f"            text: `{js_escape(s['text'])}`,\n"
-            f"            meaning: `{js_escape(s['meaning'])}`,\n"
-            f"            example: `{js_escape(s['example'])}`\n"
-            "        }"
-        )
-    return ",\n".join(entries)
+def generate_html(flat):
+    return "".join(iter_single_file(flat))
+
+
+# ------------------------------------------------------------------
+# Build variants
+# ------------------------------------------------------------------
+def load_variants(path=None):
+    """Read a JSON list of variants (or use DEFAULT_VARIANTS) and fill in defaults."""
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+    else:
+        raw, base = DEFAULT_VARIANTS, BASE_DIR
+    variants = []
+    for i, v in enumerate(raw):
+        v = dict(v)
+        v.setdefault("name", f"variant_{i}")
+        v["output"] = os.path.join(base, v["output"])
+        if v.get("template"):
+            v["template"] = os.path.join(base, v["template"])
+        v.setdefault("template", None)
+        v.setdefault("per_page", SHLOKAS_PER_PAGE)
+        v.setdefault("mode", "chunked")
+        v.setdefault("minify", False)
+        v.setdefault("compact", False)
+        v.setdefault("precompress", [])
+        v.setdefault("drop_plain_chunks", False)
+        v.setdefault("drop_plain_page", False)
+        for opt in ("drop_plain_chunks", "drop_plain_page"):
+            if v[opt] and "gz" not in v["precompress"]:
+                raise ValueError(f"variant {v['name']}: {opt} needs 'gz' in precompress")
+        v["fields"] = dict(DEFAULT_FIELDS, **v.get("fields", {}))
+        if v["mode"] not in ("chunked", "single"):
+            raise ValueError(f"variant {v['name']}: unknown mode {v['mode']!r}")
+        variants.append(v)
+    return variants
+
+
+# ------------------------------------------------------------------
+# Incremental build
+# ------------------------------------------------------------------
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _sources_hash():
+    h = hashlib.sha256()
+    for path in GENERATOR_SOURCES:
+        with open(path, "rb") as f:
+            h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def generator_hash(fields=None, compact=False):
+    # Any edit to GENERATOR_SOURCES (escaping, chunk format, search weights,
+    # speech segmentation...) or to the field mapping invalidates every
+    # cached fragment and the corpus fragments (corpus_stamp).
+    key = json.dumps([fields or DEFAULT_FIELDS, compact], sort_keys=True).encode()
+    return _sha256(_sources_hash().encode() + key + str(CACHE_VERSION).encode())
+
+
+def section_hash(mod_basename):
+    try:
+        with open(section_source_path(mod_basename), "rb") as f:
+            return _sha256(f.read())
+    except OSError:
+        # Packaged build without sources: hash the decoded data instead.
+        data = LOADED_SECTIONS[mod_basename]
+        return _sha256(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8"))
 
 
-def generate_html(flat):
-    js_array = gen_js_array(flat)
-
-    html = """<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<title>Bhagwat Geeta</title>
-<meta name="viewport" content="width=device-width, initial-scale=1">
-<style>
-body { margin:0; padding:12px; font-family:Arial; background:#ff9800; }
-.title-block { text-align:center; width:100%; }
-h1 { font-size:24px; margin:6px 0; }
-h3 { font-size:21px; margin:0 0 6px 0; }
-hr { border:none; border-bottom:2px solid black; margin:6px 0; }
-.container { display:flex; flex-direction:column; min-height:calc(100vh - 140px); }
-.content-wrap { overflow:auto; padding-bottom:12px; }
-.frame {
-  background:white; border:2px solid black; border-radius:12px;
-  padding:12px; margin-top:12px; min-height:160px;
-}
-.frame.highlight {
-  background:#e7f9e6; border-color:#8fd19b;
-  box-shadow:0 0 12px rgba(0,128,64,0.25);
-}
-button {
-  padding:7px 14px; border:none; border-radius:14px;
-  margin:3px; font-size:14px; font-weight:bold; cursor:pointer;
-}
-.green { background:#2e7d32; color:white; }
-.red { background:#b71c1c; color:white; }
-.blue { background:#1565c0; color:white; }
-.small-btn { padding:5px 10px; font-size:13px; }
-pre { white-space:pre-wrap; font-size:16px; margin-top:8px; }
-.controls-row { text-align:center; margin:8px 0; }
-.voice-controls { display:inline-block; margin-left:14px; }
-.toggle {
-  margin:0 6px; padding:6px 10px; border-radius:10px;
-  background:white; border:1px solid rgba(0,0,0,0.12); cursor:pointer;
-}
-.selected { background:#1976d2; color:white; }
-.speed-selected { background:#388e3c; color:white; }
-.nav {
-  display:flex; justify-content:space-between; font-weight:bold;
-  margin-top:12px; position:sticky; bottom:0; padding-top:10px;
-}
-</style>
-</head>
-<body>
-
-<div class="title-block">
-  <h1>Bhagwat Geeta</h1>
-  <hr>
-  <h3>📘 भगवद गीता में अपनी समस्याओं का समाधान खोजें</h3>
-  <hr>
-</div>
-
-<div class="controls-row">
-  <button class="green" onclick="startSequential()">Start</button>
-  <button class="green" onclick="nextButton()">Next</button>
-  <button class="red" onclick="stopReading()">Stop</button>
-  <button class="green" onclick="resumeReading()">Resume</button>
-  <button class="green" onclick="startRandom()">Random</button>
-  <button class="red" onclick="exitApp()">Exit</button>
-  <span id="voiceControls" class="voice-controls"></span>
-</div>
-
-<div class="container">
-  <div class="content-wrap" id="contentWrap"><div id="content"></div></div>
-  <div class="nav">
-    <button onclick="prevPage()">⬅ Previous</button>
-    <span id="pageInfo"></span>
-    <button onclick="nextPage()">Next ➡</button>
-  </div>
-</div>
-
-<script>
-const PER_PAGE = __PER_PAGE__;
-const SHLOKAS = [
-__JS_ARRAY__
-];
-
-let page = 0;
-let mode = null; // "seq" | "random" | null
-let playing = false;
-let seqIndex = 0;     // next index to play in sequential mode
-let randomList = [];  // shuffled list of indices
-let randomPos = 0;    // position in randomList
-let currentIndex = -1; // index currently being read (highlighted)
-
-// Voice & speed settings (persisted)
-let selectedGender = localStorage.getItem("gita_voice_gender") || "female";
-let selectedSpeed = localStorage.getItem("gita_voice_speed") || "slow";
-
-// Browser voice fallback
-let browserVoice = null;
-function loadBrowserVoices(){
-    const list = speechSynthesis.getVoices();
-    if(!list || !list.length) return;
-    if(selectedGender === "female"){
-        browserVoice = list.find(v => v.lang && v.lang.toLowerCase().includes('hi') && v.name && v.name.toLowerCase().includes('female'))
-            || list.find(v => v.lang && v.lang.toLowerCase().includes('hi'))
-            || list[0];
-    } else {
-        browserVoice = list.find(v => v.lang && v.lang.toLowerCase().includes('hi') && v.name && v.name.toLowerCase().includes('male'))
-            || list.find(v => v.lang && v.lang.toLowerCase().includes('hi'))
-            || list[0];
-    }
-}
-speechSynthesis.onvoiceschanged = loadBrowserVoices;
-loadBrowserVoices();
+def variant_cache_dir(variant):
+    return os.path.join(CACHE_DIR, variant["name"])
 
-// Highlight helpers
-function clearHighlights(){
-    document.querySelectorAll(".frame.highlight").forEach(e=>e.classList.remove("highlight"));
-}
-function highlightFrame(i){
-    clearHighlights();
-    const el = document.getElementById("shlok_"+i);
-    if(el){
-        el.classList.add("highlight");
-        el.scrollIntoView({behavior:'smooth', block:'center'});
-    }
-}
 
-// Called by Android via evaluateJavascript (MainActivity) when TTS finishes
-function onSpeakComplete(){
-    try {
-        if(!playing) return;
-        if(mode === "seq"){
-            playNextSequential();
-        } else if(mode === "random"){
-            playNextRandom();
-        }
-    } catch(e){}
-}
-window.onSpeakComplete = onSpeakComplete; // expose globally
-
-// Speak (prefer Android, fallback to browser)
-function speakNowIndex(i){
-    currentIndex = i;
-    const s = SHLOKAS[i];
-    const textToSpeak = "अनुभाग: " + s.section + "\\n" +
-                        s.reference + "\\n" +
-                        "संस्कृत:\\n" + s.text + "\\n" +
-                        "हिंदी अर्थ:\\n" + s.meaning + "\\n" +
-                        "उदाहरण:\\n" + s.example;
-
-    // Try Android first
-    try {
-        if(typeof Android !== "undefined" && Android && Android.speak){
-            try { Android.speak(textToSpeak, selectedGender, selectedSpeed); } catch(e){}
-            return;
-        }
-    } catch(e){}
-
-    // Browser fallback using SpeechSynthesis
-    try {
-        speechSynthesis.cancel();
-        const u = new SpeechSynthesisUtterance(textToSpeak);
-        if(browserVoice) u.voice = browserVoice;
-        if(selectedSpeed === "very_slow") u.rate = 0.72;
-        else if(selectedSpeed === "slow") u.rate = 0.82;
-        else u.rate = 0.95;
-        u.lang = (browserVoice && browserVoice.lang) ? browserVoice.lang : 'hi-IN';
-        u.onend = function(){ try{ onSpeakComplete(); } catch(e){} };
-        speechSynthesis.speak(u);
-    } catch(e){
-        setTimeout(()=>{ try{ onSpeakComplete(); }catch(e){} }, 1000);
-    }
-}
+def load_cache(variant):
+    try:
+        with open(os.path.join(variant_cache_dir(variant), "cache.json"), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("generator") != generator_hash(variant["fields"], variant["compact"]):
+        return None
+    return cache
 
-// ------------------ SEQUENTIAL MODE ------------------
-function startSequential(){
-    stopReading();
-    mode = "seq";
-    playing = true;
-    // resume from next item after currently highlighted (ensures not repeating same)
-    seqIndex = (currentIndex >= 0) ? currentIndex + 1 : 0;
-    if(seqIndex < SHLOKAS.length){
-        let i = seqIndex;
-        seqIndex++;
-        page = Math.floor(i / PER_PAGE);
-        render();
-        setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-    } else {
-        playing = false;
-    }
-}
 
-function playNextSequential(){
-    if(!playing || mode !== "seq") return;
-    if(seqIndex >= SHLOKAS.length){
-        playing = false;
-        clearHighlights();
-        return;
-    }
-    let i = seqIndex;
-    seqIndex++;
-    page = Math.floor(i / PER_PAGE);
-    render();
-    setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-}
+def save_cache(variant, cache):
+    path = os.path.join(variant_cache_dir(variant), "cache.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, path)
 
-// NEXT button behavior: immediate next shlok and continue sequentially
-function nextButton(){
-    stopReading();
-    mode = "seq";
-    playing = true;
-
-    // compute next index: highlighted+1 or currentIndex+1
-    let highlighted = -1;
-    document.querySelectorAll('.frame').forEach(function(f){
-        if(f.classList.contains('highlight')){
-            highlighted = Number(f.id.replace('shlok_',''));
-        }
-    });
-
-    let startIdx = (highlighted !== -1) ? highlighted + 1 : (currentIndex >= 0 ? currentIndex + 1 : 0);
-    if(startIdx >= SHLOKAS.length){
-        playing = false;
-        return;
-    }
 
-    seqIndex = startIdx + 1; // set seqIndex for subsequent items
-    let i = startIdx;
-    page = Math.floor(i / PER_PAGE);
-    render();
-    setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-}
+def fragment_path(variant, name):
+    return os.path.join(variant_cache_dir(variant), "fragments", f"{name}.js")
 
-// ------------------ RANDOM MODE ------------------
-function startRandom(){
-    stopReading();
-    mode = "random";
-    playing = true;
-
-    // build shuffled list
-    randomList = [];
-    for(let i=0;i<SHLOKAS.length;i++) randomList.push(i);
-    for(let i=randomList.length-1;i>0;i--){
-        const j = Math.floor(Math.random()*(i+1));
-        const tmp = randomList[i]; randomList[i] = randomList[j]; randomList[j] = tmp;
-    }
-    randomPos = 0;
-
-    if(randomPos < randomList.length){
-        let i = randomList[randomPos++];
-        page = Math.floor(i / PER_PAGE);
-        render();
-        setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-    } else {
-        playing = false;
-    }
-}
 
-function playNextRandom(){
-    if(!playing || mode !== "random") return;
-    if(randomPos >= randomList.length){
-        // reshuffle and continue
-        for(let i=randomList.length-1;i>0;i--){
-            const j = Math.floor(Math.random()*(i+1));
-            const tmp = randomList[i]; randomList[i] = randomList[j]; randomList[j] = tmp;
-        }
-        randomPos = 0;
-    }
-    if(randomPos < randomList.length){
-        let i = randomList[randomPos++];
-        page = Math.floor(i / PER_PAGE);
-        render();
-        setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-    } else {
-        playing = false;
-    }
-}
+def search_fragment_path():
+    # Variant-independent: built once per corpus and shared by every variant.
+    return os.path.join(CACHE_DIR, "search_index.js")
 
-// Read a single shlok (user clicks this shlok's play button) — plays that one only
-function readSingle(i){
-    stopReading();
-    mode = null;
-    playing = true;
-    currentIndex = i;
-    page = Math.floor(i / PER_PAGE);
-    render();
-    setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-}
 
-// STOP / RESUME / EXIT
-function stopReading(){
-    playing = false;
-    try { if(typeof Android !== "undefined" && Android && Android.stopSpeak) Android.stopSpeak(); } catch(e){}
-    try { speechSynthesis.cancel(); } catch(e){}
-    clearHighlights();
-}
+def lookup_fragment_path():
+    # Like the search index, the verse lookup spans the whole corpus.
+    return os.path.join(CACHE_DIR, "lookup.json")
 
-function resumeReading(){
-    if(playing) return; // already playing
-    // resume depending on mode
-    if(mode === "seq"){
-        // ensure we resume from next item after currentIndex
-        seqIndex = Math.max(seqIndex, (currentIndex >= 0 ? currentIndex + 1 : 0));
-        if(seqIndex < SHLOKAS.length){
-            playing = true;
-            let i = seqIndex;
-            seqIndex++;
-            page = Math.floor(i / PER_PAGE);
-            render();
-            setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-        }
-    } else if(mode === "random"){
-        if(randomPos < randomList.length){
-            playing = true;
-            let i = randomList[randomPos++];
-            page = Math.floor(i / PER_PAGE);
-            render();
-            setTimeout(()=>{ highlightFrame(i); speakNowIndex(i); }, 180);
-        }
-    }
-}
 
-function exitApp(){
-    try { if(typeof Android !== "undefined" && Android && Android.exitApp) Android.exitApp(); } catch(e){}
-    try { window.close(); } catch(e){}
-}
+def corpus_fragment_paths():
+    return [search_fragment_path(), lookup_fragment_path()]
 
-// ------------------ RENDER / PAGINATION ------------------
-function render(){
-    const start = page * PER_PAGE;
-    const end = Math.min(start + PER_PAGE, SHLOKAS.length);
-    let html = "";
-    for(let i=start;i<end;i++){
-        let s = SHLOKAS[i];
-        html += `
-        <div class="frame" id="shlok_${i}">
-            <div style="font-weight:bold; margin-bottom:6px;">
-                ${i+1})
-                <button class="blue small-btn" onclick="readSingle(${i})">▶ Start This Shlok</button>
-                <button class="red small-btn" onclick="stopReading()">■ Stop</button>
-            </div>
-
-            <h4>📗 अनुभाग: ${s.section}</h4>
-            <b>समस्या:</b> ${s.problem}<br><br>
-
-            <b>${s.reference}</b><br><br>
-
-            <b>संस्कृत:</b><br>
-            <pre>${s.text}</pre>
-
-            <b>हिंदी अर्थ:</b><br>
-            ${s.meaning}<br><br>
-
-            <b>उदाहरण:</b><br>
-            ${s.example}
-        </div>`;
-    }
-    document.getElementById("content").innerHTML = html;
-    document.getElementById("pageInfo").innerText = "Page "+(page+1)+" / "+Math.ceil(SHLOKAS.length/PER_PAGE);
-}
 
-function nextPage(){
-    page = (page + 1) % Math.ceil(SHLOKAS.length/PER_PAGE);
-    render();
-}
-function prevPage(){
-    page = (page - 1 + Math.ceil(SHLOKAS.length/PER_PAGE)) % Math.ceil(SHLOKAS.length/PER_PAGE);
-    render();
-}
+def corpus_stamp(corpus_hash):
+    return f"{generator_hash()}:{corpus_hash}"
 
-// ------------------ VOICE & SPEED UI ------------------
-function renderVoiceControls(){
-    const c = document.getElementById("voiceControls");
-    c.innerHTML = "";
-
-    const g1 = document.createElement("button");
-    g1.textContent = "♀ Female";
-    g1.className = "toggle" + (selectedGender==="female" ? " selected" : "");
-    g1.onclick = function(){
-        selectedGender = "female";
-        localStorage.setItem("gita_voice_gender","female");
-        try { if(typeof Android !== "undefined" && Android && Android.setVoice) Android.setVoice("female"); } catch(e){}
-        try { if(typeof Android !== "undefined" && Android && Android.setSpeed) Android.setSpeed(selectedSpeed); } catch(e){}
-        loadBrowserVoices();
-        renderVoiceControls();
-    };
-    c.appendChild(g1);
-
-    const g2 = document.createElement("button");
-    g2.textContent = "Male";
-    g2.className = "toggle" + (selectedGender==="male" ? " selected" : "");
-    g2.onclick = function(){
-        selectedGender = "male";
-        localStorage.setItem("gita_voice_gender","male");
-        try { if(typeof Android !== "undefined" && Android && Android.setVoice) Android.setVoice("male"); } catch(e){}
-        try { if(typeof Android !== "undefined" && Android && Android.setSpeed) Android.setSpeed(selectedSpeed); } catch(e){}
-        loadBrowserVoices();
-        renderVoiceControls();
-    };
-    c.appendChild(g2);
-
-    const speeds = [
-        {key:'very_slow', label:'Very Slow'},
-        {key:'slow', label:'Slow'},
-        {key:'medium', label:'Medium'}
-    ];
-    speeds.forEach(function(s){
-        const b = document.createElement("button");
-        b.textContent = s.label;
-        b.className = "toggle" + (selectedSpeed===s.key ? " speed-selected" : "");
-        b.onclick = function(){
-            selectedSpeed = s.key;
-            localStorage.setItem("gita_voice_speed", s.key);
-            try { if(typeof Android !== "undefined" && Android && Android.setSpeed) Android.setSpeed(s.key); } catch(e){}
-            renderVoiceControls();
-        };
-        c.appendChild(b);
-    });
-}
 
-// initial
-renderVoiceControls();
-render();
+def corpus_fragments_fresh(corpus_hash):
+    """True if the search index and lookup were built from this corpus."""
+    try:
+        with open(search_fragment_path() + ".stamp", "r", encoding="utf-8") as f:
+            return f.read() == corpus_stamp(corpus_hash) and all(map(os.path.exists, corpus_fragment_paths()))
+    except OSError:
+        return False
+
+
+def write_corpus_fragments(flat, corpus_hash):
+    stream_to_file(search_fragment_path(), iter_search_index(flat))
+    stream_to_file(lookup_fragment_path(), iter_json(build_lookup(flat).to_compact()))
+    stream_to_file(search_fragment_path() + ".stamp", [corpus_stamp(corpus_hash)])
+
+
+def iter_file(path, block_size=1 << 16):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def page_stamp(variant, corpus_hash):
+    """Everything a single-file page depends on besides the generator itself."""
+    template = variant["template"] or TEMPLATE_HTML
+    with open(template, "rb") as f:
+        template_hash = _sha256(f.read())
+    # fields and compact are covered by the cache's generator hash.
+    options = [variant["per_page"], variant["minify"], variant["precompress"], variant["drop_plain_page"]]
+    return f"{corpus_hash}:{template_hash}:{json.dumps(options)}"
+
+
+def stale_sections(variant, names, hashes, corpus_hash):
+    """
+    Sections whose cached fragment for this variant is missing or out of date.
+    A single-file page is rebuilt whole, so it is either all of them or none.
+    """
+    if variant["mode"] == "single":
+        out_dir = os.path.dirname(variant["output"])
+        stamp = (load_cache(variant) or {}).get("page")
+        outputs = output_paths(variant, out_dir, os.path.basename(variant["output"]))
+        if stamp == page_stamp(variant, corpus_hash) and all(map(os.path.exists, outputs)):
+            return []
+        return list(names)
+    cached = (load_cache(variant) or {}).get("sections", {})
+    return [
+        m for m in names
+        if cached.get(m, {}).get("hash") != hashes[m] or not os.path.exists(fragment_path(variant, m))
+    ]
+
+
+def drops_plain(variant, relpath):
+    """True if `relpath` ships only in its precompressed form for this variant."""
+    if relpath.startswith(CHUNK_DIR + "/"):
+        return variant["drop_plain_chunks"]
+    return variant["drop_plain_page"] and relpath == os.path.basename(variant["output"])
+
+
+def output_paths(variant, out_dir, relpath):
+    """Files that writing `relpath` for this variant produces in out_dir."""
+    target = os.path.join(out_dir, relpath)
+    paths = [f"{target}.{fmt}" for fmt in variant["precompress"]]
+    if not drops_plain(variant, relpath):
+        paths.insert(0, target)
+    return paths
+
+
+def write_output(variant, out_dir, relpath, pieces):
+    """
+    Write one output file plus its precompressed copies. A plain file the
+    variant drops (drops_plain) is kept in the cache only, as the source for
+    compression, and removed from out_dir. Returns the paths written.
+    """
+    target = os.path.join(out_dir, relpath)
+    if drops_plain(variant, relpath):
+        plain = os.path.join(variant_cache_dir(variant), "plain", relpath)
+        changed = write_if_changed(plain, pieces)
+        written = []
+        if os.path.exists(target):
+            os.remove(target)
+    else:
+        plain = target
+        changed = write_if_changed(plain, pieces)
+        written = [target] if changed else []
+    formats = [fmt for fmt in variant["precompress"]
+               if changed or not os.path.exists(f"{target}.{fmt}")]
+    if formats:
+        written += precompress(plain, formats, dest=target)
+    return written
+
+
+def build_variant(variant, names, hashes, corpus, corpus_hash):
+    """
+    Write one variant. `corpus` maps section basename -> [Verse] for (at
+    least) every section this variant has to re-escape. Chunked variants
+    re-escape only sections whose content hash changed since the last run;
+    escaped fragments live in files under CACHE_DIR and are streamed from
+    there, so only one section is ever held in memory.
+
+    Returns (variant name, changed names, paths written).
+    """
+    out_dir = os.path.dirname(variant["output"])
+    fields, compact = variant["fields"], variant["compact"]
+
+    if variant["mode"] == "single":
+        if not stale_sections(variant, names, hashes, corpus_hash):
+            return variant["name"], [], []
+        flat = [v for m in names for v in corpus[m]]
+        pieces = iter_single_file(flat, fields, variant["template"], variant["per_page"],
+                                  iter_file(search_fragment_path()), variant["minify"], compact)
+        written = write_output(variant, out_dir, os.path.basename(variant["output"]), pieces)
+        save_cache(variant, {"generator": generator_hash(fields, compact),
+                             "page": page_stamp(variant, corpus_hash)})
+        return variant["name"], ["all"], written
+
+    cache = load_cache(variant) or {"generator": generator_hash(fields, compact), "sections": {}}
+    cached = cache["sections"]
+    changed = stale_sections(variant, names, hashes, corpus_hash)
+    for m in changed:
+        stream_to_file(fragment_path(variant, m), iter_chunk_args(corpus[m], fields, compact))
+        cached[m] = {"hash": hashes[m], "count": len(corpus[m])}
+    for m in list(cached):
+        if m not in hashes:
+            del cached[m]
+    if cache.get("corpus") != corpus_hash:
+        cache["corpus"] = corpus_hash
+        changed = changed or ["search_index"]
+
+    files = {}
+    chunks = []
+    start = 0
+    for m in names:
+        count = cached[m]["count"]
+        if not count:
+            continue
+        path = f"{CHUNK_DIR}/{m}.js"
+        files[path] = iter_chunk(len(chunks), iter_file(fragment_path(variant, m)))
+        # ?v= busts browser caches when a section changes.
+        chunks.append({"src": f"{path}?v={hashes[m][:10]}", "start": start, "count": count})
+        start += count
+
+    search_path = f"{CHUNK_DIR}/{SEARCH_CHUNK}"
+    files[search_path] = iter_search_chunk(iter_file(search_fragment_path()))
+    with open(lookup_fragment_path(), "r", encoding="utf-8") as f:
+        lookup = json.load(f)
+    manifest = page_manifest(start, chunks, f"{search_path}?v={corpus_hash[:10]}", fields, compact, lookup)
+    files[os.path.basename(variant["output"])] = iter_page(
+        manifest, template=variant["template"], per_page=variant["per_page"], minify=variant["minify"]
+    )
 
-</script>
-</body>
-</html>
-"""
-    html = html.replace("__PER_PAGE__", str(SHLOKAS_PER_PAGE))
-    html = html.replace("__JS_ARRAY__", js_array)
-    return html
+    written = []
+    for path, pieces in files.items():
+        written += write_output(variant, out_dir, path, pieces)
+    remove_stale_chunks(out_dir, {p for path in files for p in output_paths(variant, out_dir, path)})
+    if changed:
+        save_cache(variant, cache)
+    return variant["name"], changed, written
+
+
+def remove_stale_chunks(out_dir, keep):
+    chunk_dir = os.path.join(out_dir, CHUNK_DIR)
+    if not os.path.isdir(chunk_dir):
+        return
+    keep = {os.path.normpath(p) for p in keep}
+    for name in os.listdir(chunk_dir):
+        path = os.path.normpath(os.path.join(chunk_dir, name))
+        if name.endswith((".js", ".gz", ".br")) and path not in keep:
+            os.remove(path)
+
+
+def stream_to_file(path, pieces, only_if_changed=False):
+    """
+    Write an iterable of str pieces to `path` through a buffered temp file,
+    then move it into place. With only_if_changed, an existing file with
+    identical bytes is left untouched. Returns True if `path` was written.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="", buffering=1 << 16) as f:
+        for piece in pieces:
+            f.write(piece)
+    if only_if_changed and os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def write_if_changed(path, pieces):
+    """Write `pieces` (a str or iterable of str) only if the bytes differ."""
+    if isinstance(pieces, str):
+        pieces = [pieces]
+    return stream_to_file(path, pieces, only_if_changed=True)
+
+
+# Corpus shared with pool workers; set once per worker by the initializer.
+_WORKER_CORPUS = None
+
+
+def _init_worker(corpus):
+    global _WORKER_CORPUS
+    _WORKER_CORPUS = corpus
+
+
+def _build_in_worker(variant, names, hashes, corpus_hash):
+    return build_variant(variant, names, hashes, _WORKER_CORPUS, corpus_hash)
+
+
+def build_all(variants, jobs=None):
+    """
+    Build every variant from one flattened corpus. Sections are hashed and,
+    if anything is stale, flattened once here; the variants themselves are
+    built concurrently in a process pool.
+    """
+    names = REGISTRY.names()
+    hashes = {m: section_hash(m) for m in names}
+    corpus_hash = _sha256("\0".join(hashes[m] for m in names).encode())
+
+    stale = {m for v in variants for m in stale_sections(v, names, hashes, corpus_hash)}
+    corpus_fresh = corpus_fragments_fresh(corpus_hash)
+    corpus = {}
+    if stale or not corpus_fresh:
+        # Cached by source hash: only re-checked when a SECTION file changed.
+        issues = validate_corpus(LOADED_SECTIONS, SECTION_MAP)
+        report(issues)
+        if errors(issues):
+            raise ValueError(f"{len(errors(issues))} data errors in the SECTION files, see above")
+        flat = flatten(LOADED_SECTIONS)
+        for m in names:
+            corpus[m] = []
+        for v in flat:
+            corpus[v.section].append(v)
+        if not corpus_fresh:
+            write_corpus_fragments(flat, corpus_hash)
+
+    if jobs == 1 or len(variants) == 1:
+        return [build_variant(v, names, hashes, corpus, corpus_hash) for v in variants]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(corpus,)) as pool:
+        futures = [pool.submit(_build_in_worker, v, names, hashes, corpus_hash) for v in variants]
+        return [f.result() for f in futures]
+
+
+def _arg_value(flag):
+    if flag in sys.argv:
+        i = sys.argv.index(flag)
+        if i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return None
 
 
 def main():
-    flat = flatten_sections(ALL_SHLOKAS)
-    html = generate_html(flat)
+    variants = load_variants(_arg_value("--variants"))
+    only = _arg_value("--only")
+    if only:
+        variants = [v for v in variants if v["name"] in only.split(",")]
+    jobs = _arg_value("--jobs")
+    if "--full" in sys.argv:
+        import shutil
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
 
-    os.makedirs(os.path.dirname(OUTPUT_HTML), exist_ok=True)
-    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    print("✔ HTML Generated:", OUTPUT_HTML)
     try:
-        webbrowser.open("file://" + OUTPUT_HTML)
+        results = build_all(variants, int(jobs) if jobs else None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for name, changed, written in results:
+        if written:
+            print(f"✔ [{name}] HTML Generated | rebuilt: {', '.join(changed)} | files written: {len(written)}")
+        else:
+            print(f"✔ [{name}] HTML up to date")
+
+    # The first page that exists in plain form (android ships .gz only).
+    page = next((v["output"] for v in variants if os.path.exists(v["output"])), None)
+    if "--no-open" in sys.argv or page is None:
+        return
+    try:
+        webbrowser.open("file://" + page)
     except:
         pass
 
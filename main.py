@@ -1,84 +1,160 @@
-import os, sys
-from kivy.app import App
-from kivy.uix.boxlayout import BoxLayout
-from kivy.properties import ListProperty, DictProperty, StringProperty
-from kivy.core.text import LabelBase
+import os, sys, threading
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from data.shlokas import ALL_SHLOKAS
-from utils.exporter import export_to_txt
+# First, so its clock starts before anything slow (see utils/startup_trace.py).
+from utils.startup_trace import TRACE
+
+with TRACE.phase("kivy import"):
+    # Only what the splash needs; the rest of Kivy is imported by
+    # main_screen once the splash is on screen.
+    from kivy.app import App
+    from kivy.clock import Clock
+    from kivy.properties import StringProperty
+    from kivy.uix.label import Label
 
 FONT_PATH = os.path.join('android','app','src','main','assets','fonts','NotoSerifDevanagari-Regular.ttf')
 
-if os.path.exists(FONT_PATH):
-    LabelBase.register(name="DevFont", fn_regular=FONT_PATH)
-    print("✅ Sanskrit Font Loaded")
-else:
+
+def register_font():
+    from kivy.core.text import LabelBase
+
+    if os.path.exists(FONT_PATH):
+        LabelBase.register(name="DevFont", fn_regular=FONT_PATH)
+        print("✅ Sanskrit Font Loaded")
+        return "DevFont"
     print("❌ Font missing:", FONT_PATH)
+    return "Roboto"
 
 
-def flatten(all_sec):
-    result = []
-    for sec in all_sec:
-        if isinstance(sec, list):
-            sec = sec[0]
-        title = sec.get("title", "")
-        for s in sec.get("shlokas", []):
-            result.append({
-                "section": title,
-                "problem": s.get("problem", ""),
-                "sloka": s.get("reference", ""),
-                "text": s.get("text", ""),
-                "meaning": s.get("meaning", ""),
-                "example": s.get("example", "")
-            })
-    return result
-
-
-class MainScreen(BoxLayout):
-
-    sections = ListProperty([])
-    selected = DictProperty({})
-    status_text = StringProperty("")
-
-    def __init__(self, **kw):
-        super().__init__(**kw)
-        self.sections = flatten(ALL_SHLOKAS)
-        self.load_list()
-
-    def load_list(self):
-        # Requires a RecycleView with id 'rv' and a Label with id 'content_label' in kv
-        self.ids.rv.data = [
-            {"text": f"{x['problem']} ({x['sloka']})", "index": i}
-            for i, x in enumerate(self.sections)
-        ]
-        if self.sections:
-            self.show(0)
-
-    def on_select_problem(self, i):
-        self.show(i)
-
-    def show(self, i):
-        d = self.sections[i]
-        self.ids.content_label.text = (
-            f"📖 {d['section']}\n\n"
-            f"📜 {d['sloka']}\n\n"
-            f"{d['text']}\n\n"
-            f"Meaning: {d['meaning']}\n\n"
-            f"Example: {d['example']}"
-        )
-
-    def export_all(self):
-        p = export_to_txt(self.sections)
-        self.status_text = f"Saved: {p}"
+def prepare_data(on_titles, on_section, on_lookup):
+    """
+    Section titles, then each section's verses as it is decoded, then the
+    lookup index - no Kivy, safe off the UI thread.
+    """
+    from data.shlokas import LOADED_SECTIONS, section_titles
+    from data.lookup import build_lookup
+    from data.verses import iter_flatten
+
+    with TRACE.phase("section titles", cat="data"):
+        on_titles(section_titles())
+    verses = []
+    with TRACE.phase("section loading + flatten", cat="data"):
+        for basename, section_verses in iter_flatten(LOADED_SECTIONS):
+            verses += section_verses
+            on_section(basename, section_verses)
+    with TRACE.phase("build_lookup", cat="data"):
+        on_lookup(build_lookup(verses))
 
 
 class GitaApp(App):
+    """
+    Splash-first startup: build() returns a bare Label so the window opens
+    immediately. Data is prepared on a worker thread while the UI thread
+    registers the font and loads gita.kv in Clock-scheduled steps, one per
+    frame. The main screen replaces the splash as soon as the section titles
+    are known; verses are added section by section as they are decoded.
+    """
+
+    font_name = StringProperty("Roboto")
+
     def build(self):
         self.title = "Bhagavad Gita Solutions"
-        return MainScreen()
+        self._titles = None
+        self._screen = None
+        # Sections / lookup that arrived before the screen existed.
+        self._backlog = []
+        self._ui_ready = False
+        threading.Thread(target=self._prepare_data, name="startup-data", daemon=True).start()
+        Clock.schedule_once(self._load_font, 0)
+
+        if TRACE.enabled:
+            from kivy.core.window import Window
+
+            def first_frame(*args):
+                Window.unbind(on_flip=first_frame)
+                TRACE.mark("first frame")
+            Window.bind(on_flip=first_frame)
+        self._splash = Label(text="Bhagavad Gita Solutions\n\nLoading…", halign="center")
+        return self._splash
+
+    def load_kv(self, filename=None):
+        # gita.kv is loaded by _load_ui, after the splash is on screen.
+        return None
+
+    def _prepare_data(self):
+        def post(fn):
+            # Run fn on the UI thread with the worker's arguments.
+            return lambda *args: Clock.schedule_once(lambda dt: fn(*args))
+
+        try:
+            prepare_data(post(self._titles_ready), post(self._section_ready),
+                         post(self._lookup_ready))
+        except Exception as e:
+            message = f"Failed to load data:\n{e}"
+            print("❌", message)
+            Clock.schedule_once(lambda dt: self._data_failed(message))
+
+    def _load_font(self, dt):
+        with TRACE.phase("LabelBase.register"):
+            self.font_name = register_font()
+        Clock.schedule_once(self._load_ui, 0)
+
+    def _load_ui(self, dt):
+        with TRACE.phase("main_screen import"):
+            import main_screen  # noqa: F401  (registers MainScreen with the Factory)
+        with TRACE.phase("gita.kv"):
+            super().load_kv()
+        self._ui_ready = True
+        self._show_main()
+
+    def _titles_ready(self, titles):
+        self._titles = titles
+        self._show_main()
+
+    def _section_ready(self, basename, verses):
+        self._to_screen("add_section", basename, verses)
+
+    def _lookup_ready(self, lookup):
+        TRACE.mark("data complete")
+        self._to_screen("set_lookup", lookup)
+        if TRACE.enabled:
+            # Rewritten with the loading phases that finished after the screen.
+            Clock.schedule_once(lambda dt: TRACE.write(), 0)
+
+    def _to_screen(self, method, *args):
+        # Held back until the main screen exists, then replayed in order.
+        if self._screen is None:
+            self._backlog.append((method, args))
+        else:
+            getattr(self._screen, method)(*args)
+
+    def _data_failed(self, message):
+        if self._screen is None:
+            self._splash.text = message
+        else:
+            self._screen.status_text = message
+
+    def _show_main(self):
+        if self._titles is None or not self._ui_ready:
+            return
+        from main_screen import MainScreen
+
+        with TRACE.phase("build"):
+            screen = MainScreen(titles=self._titles)
+        window = self.root_window
+        window.remove_widget(self._splash)
+        self.root = screen
+        window.add_widget(screen)
+        self._screen = screen
+        for method, args in self._backlog:
+            getattr(screen, method)(*args)
+        self._backlog = []
+        TRACE.mark("main screen")
+        if TRACE.enabled:
+            Clock.schedule_once(lambda dt: TRACE.write(), 0)
 
 
 if __name__ == "__main__":
+    TRACE.mark("run")
     GitaApp().run()
@@ -0,0 +1,223 @@
+# main_screen.py
+"""
+The main UI of the desktop app (layout rules in gita.kv).
+
+Imported by GitaApp only after the splash frame is on screen, so the
+widget, RecycleView and text-rendering imports below stay off the launch
+path.
+"""
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.metrics import dp, sp
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview.datamodel import RecycleDataModelBehavior
+from kivy.properties import ListProperty, DictProperty, StringProperty, NumericProperty
+from kivy.core.text import Label as CoreLabel
+
+from data.shlokas import LOADED_SECTIONS
+from data.search import build_index
+from data.lookup import build_lookup
+from data.verses import flatten
+from utils.exporter import ExportJob
+from utils.startup_trace import TRACE
+from utils.text_cache import TextureCache
+from utils.verse_rows import VerseRows
+
+
+class LazyDataModel(RecycleDataModelBehavior, EventDispatcher):
+    """
+    RecycleView data model backed by a VerseRows sequence. Unlike the default
+    model it never copies the rows into an ObservableList. The layout still
+    walks every row on each refresh (compute_sizes_from_data), so each
+    refresh builds and drops one dict per row; refreshes are kept rare.
+    """
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self._rows = []
+
+    @property
+    def data(self):
+        return self._rows
+
+    @data.setter
+    def data(self, rows):
+        self._rows = rows
+        self.refresh()
+
+    def refresh(self):
+        self.dispatch("on_data_changed")
+
+
+class MainScreen(BoxLayout):
+
+    sections = ListProperty([])
+    selected = DictProperty({})
+    status_text = StringProperty("")
+    content_font_size = NumericProperty(sp(15))
+    export_text = StringProperty("Export")
+
+    def __init__(self, verses=None, lookup=None, titles=None, **kw):
+        # GitaApp passes section titles first and feeds verses in through
+        # add_section() / set_lookup() as they are prepared off the UI thread.
+        # Without titles everything is built here.
+        with TRACE.phase("MainScreen kv rules"):
+            super().__init__(**kw)
+        # basename -> problem titles of the sections still to come
+        self._pending = dict(titles or ())
+        if verses is None and titles is None:
+            with TRACE.phase("flatten"):
+                verses = flatten(LOADED_SECTIONS)
+        self.sections = verses or []
+        self._search_index = None
+        if lookup is None and titles is None:
+            with TRACE.phase("build_lookup"):
+                lookup = build_lookup(self.sections)
+        self._lookup = lookup
+        self._rows = None
+        self._current = None
+        self._export = None
+        # Rendered verse textures keyed by (index, font size, wrap width).
+        self._textures = TextureCache(self._render_verse, schedule=Clock.schedule_once)
+        self._redraw = Clock.create_trigger(self._on_layout_change)
+        # Sections decoded in the same frame share one list refresh.
+        self._sections_added = Clock.create_trigger(self._refresh_list)
+        self.ids.content_scroll.bind(width=lambda *a: self._redraw())
+        self.bind(content_font_size=lambda *a: self._redraw())
+        self.ids.rv.data_model = LazyDataModel()
+        with TRACE.phase("load_list"):
+            self.load_list()
+
+    def load_list(self, indices=None):
+        # Requires a RecycleView with id 'rv' and a Label with id 'content_label' in kv.
+        # Without indices: every verse grouped under collapsible problem headers.
+        # Collapsed groups survive a round trip through search.
+        collapsed = self._rows.collapsed if self._rows is not None else ()
+        pending = [t for titles in self._pending.values() for t in titles]
+        rows = VerseRows(self.sections, indices, collapsed=collapsed, pending=pending)
+        if indices is None:
+            self._rows = rows
+            if self.sections and self._current is None:
+                self.show(0)
+        self.ids.rv.data = rows
+
+    def add_section(self, basename, verses):
+        """Append the verses of a section decoded after the screen came up."""
+        self._pending.pop(basename, None)
+        self.sections.extend(verses)
+        self._search_index = None
+        self._sections_added()
+
+    def _refresh_list(self, dt):
+        self.on_search(self.ids.search_input.text)
+
+    def set_lookup(self, lookup):
+        self._lookup = lookup
+        # A verse reference typed while loading can resolve now.
+        if self.ids.search_input.text.strip():
+            self.on_search(self.ids.search_input.text)
+
+    def toggle_group(self, group):
+        if self._rows is None:
+            return
+        self._rows.toggle(group)
+        self.ids.rv.data_model.refresh()
+
+    def on_search(self, query):
+        query = query.strip()
+        if not query:
+            self.load_list()
+            self.status_text = ""
+            return
+        # "2.47" / "id=25" jumps straight to the verse(s) it names.
+        refs = self._lookup.resolve_ref(query) if self._lookup is not None else None
+        if refs:
+            self.load_list(refs)
+            self.show(refs[0])
+            self.status_text = f"{len(refs)} results"
+            return
+        # Built on first use so it never delays the first frame.
+        if self._search_index is None:
+            self._search_index = build_index(self.sections)
+        hits = self._search_index.search(query, limit=None)
+        self.load_list([i for i, _ in hits])
+        self.status_text = f"{len(hits)} results"
+
+    def on_select_problem(self, i):
+        self.show(i)
+
+    def _texture_key(self, i):
+        width = max(1, int(self.ids.content_scroll.width - dp(16)))
+        return (i, int(self.content_font_size), width)
+
+    def _on_layout_change(self, dt):
+        # Textures for another width or font size will not be reused.
+        layout = self._texture_key(0)[1:]
+        self._textures.retain(lambda key: key[1:] == layout)
+        if self._current is not None:
+            self.show(self._current)
+
+    def _render_verse(self, key):
+        # Shaping and rasterising the Devanagari block is the slow part of
+        # selecting a verse; it happens once per key, then the texture is reused.
+        i, font_size, width = key
+        d = self.sections[i]
+        label = CoreLabel(
+            text=(
+                f"📖 {d.problem}\n\n"
+                f"📜 {d.reference}\n\n"
+                f"{d.text}\n\n"
+                f"Meaning: {d.meaning}\n\n"
+                f"Example: {d.example}"
+            ),
+            font_name=App.get_running_app().font_name,
+            font_size=font_size,
+            text_size=(width, None),
+            padding=dp(8),
+        )
+        label.refresh()
+        return label.texture
+
+    def show(self, i):
+        self._current = i
+        self.ids.content_view.texture = self._textures.get(self._texture_key(i))
+        self.ids.content_scroll.scroll_y = 1
+        # Warm the verses either side so stepping through them is a texture swap.
+        neighbours = [j for j in (i + 1, i - 1, i + 2) if 0 <= j < len(self.sections)]
+        self._textures.prefetch([self._texture_key(j) for j in neighbours])
+
+    def export_all(self):
+        # The button doubles as "Cancel" while an export is running.
+        if self._export is not None and self._export.running:
+            self._export.cancel()
+            return
+        if self._pending:
+            self.status_text = "Still loading verses…"
+            return
+        self._export = ExportJob(
+            self.sections,
+            on_progress=self._on_export_progress,
+            on_done=self._on_export_done,
+            on_cancel=self._on_export_cancel,
+            on_error=self._on_export_error,
+            dispatch=lambda fn, *args: Clock.schedule_once(lambda dt: fn(*args)),
+        ).start()
+        self.export_text = "Cancel"
+        self.status_text = "Exporting…"
+
+    def _on_export_progress(self, done, total):
+        self.status_text = f"Exporting… {done}/{total}"
+
+    def _on_export_done(self, path):
+        self.export_text = "Export"
+        self.status_text = f"Saved: {path}"
+
+    def _on_export_cancel(self):
+        self.export_text = "Export"
+        self.status_text = "Export cancelled"
+
+    def _on_export_error(self, exc):
+        self.export_text = "Export"
+        self.status_text = f"Export failed: {exc}"
@@ -0,0 +1,139 @@
+# tests/test_player.py
+"""
+Playback of the generated Android page, run under Node with a minimal DOM
+and a simulated speech queue. Skipped when node is not installed.
+
+    python -m unittest discover tests
+"""
+
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HTML_DIR = os.path.join(BASE_DIR, "android", "app", "src", "main", "assets", "html")
+PAGE = os.path.join(HTML_DIR, "gita_shlokas.html.gz")
+
+# argv: page file, html dir, saved resume state. Prints the verses spoken
+# after resumeReading() and the final player state as JSON.
+HARNESS = r"""
+const fs = require("fs"), path = require("path"), zlib = require("zlib");
+const [pageFile, htmlDir, saved] = process.argv.slice(2);
+const html = fs.readFileSync(pageFile, "utf8");
+function el(){
+    const e = {style: {}, dataset: {}, children: [], innerHTML: "", textContent: "", className: "",
+        appendChild(c){
+            this.children.push(c);
+            if(c.src) setTimeout(()=>{
+                const f = path.join(htmlDir, c.src.split("?")[0]);
+                (0, eval)(fs.existsSync(f) ? fs.readFileSync(f, "utf8")
+                                           : zlib.gunzipSync(fs.readFileSync(f + ".gz")).toString("utf8"));
+                c.onload && c.onload();
+            }, 1);
+            return c;
+        },
+        insertBefore(c){ return c; }, removeChild(){}, remove(){}, scrollIntoView(){},
+        addEventListener(){}, setAttribute(){}, getAttribute(){ return null; },
+        querySelector(){ return el(); },
+        querySelectorAll(sel){
+            // frame parts, looked up by data-f in the frame's markup
+            if(sel !== "[data-f]") return [];
+            return [...this.innerHTML.matchAll(/data-f="(\w+)"/g)].map(m => {
+                const p = el(); p.dataset.f = m[1]; return p;
+            });
+        },
+        getBoundingClientRect(){ return {top: 0, bottom: 100, height: 100}; }};
+    e.classList = {add(){}, remove(){}, contains(){ return false; }, toggle(){}};
+    return e;
+}
+const els = {};
+global.window = global;
+global.document = {getElementById: id => (els[id] = els[id] || el()), createElement: el,
+    createDocumentFragment: el, querySelectorAll: () => [], querySelector: el,
+    addEventListener(){}, head: el(), body: el()};
+global.addEventListener = function(){};
+global.innerHeight = 800;
+global.location = {hash: ""};
+global.history = {replaceState(){}};
+global.requestAnimationFrame = f => setTimeout(f, 0);
+global.IntersectionObserver = function(){ this.observe = this.unobserve = this.disconnect = ()=>{}; };
+const store = {gita_resume: saved};
+global.localStorage = {getItem: k => k in store ? store[k] : null,
+                       setItem(k, v){ store[k] = String(v); }, removeItem(k){ delete store[k]; }};
+global.SpeechSynthesisUtterance = function(text){ this.text = text; };
+global.speechSynthesis = {q: [], cur: null, getVoices: () => [],
+    speak(u){ this.q.push(u); this._next(); },
+    _next(){
+        if(this.cur) return;
+        const u = this.cur = this.q.shift();
+        if(!u){ this.cur = null; return; }
+        setTimeout(()=>{
+            if(this.cur !== u) return;
+            u.onstart && u.onstart();
+            setTimeout(()=>{ if(this.cur !== u) return; this.cur = null; u.onend && u.onend(); this._next(); }, 1);
+        }, 0);
+    },
+    cancel(){
+        const all = [this.cur, ...this.q].filter(Boolean);
+        this.q = []; this.cur = null;
+        all.forEach(u => u.onerror && u.onerror({error: "interrupted"}));
+    }};
+let code = "";
+for(const m of html.matchAll(/<script(?![^>]*src)([^>]*)>([\s\S]*?)<\/script>/g)){
+    if(!/application\/json/.test(m[1])) code += m[2] + "\n";
+}
+code += `
+setTimeout(()=>{
+    const spoken = [];
+    resumeReading();
+    const t = setInterval(()=>{
+        if(spoken[spoken.length - 1] !== PLAYER.current) spoken.push(PLAYER.current);
+        if(PLAYER.state !== "playing" || spoken.length > 3){
+            clearInterval(t);
+            console.log(JSON.stringify({spoken: spoken, state: PLAYER.state}));
+            process.exit(0);
+        }
+    }, 5);
+}, 50);`;
+(0, eval)(code);
+"""
+
+
+@unittest.skipUnless(shutil.which("node") and os.path.exists(PAGE), "needs node and the generated page")
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.page = os.path.join(tmp.name, "page.html")
+        with gzip.open(PAGE, "rb") as src, open(self.page, "wb") as dst:
+            dst.write(src.read())
+        self.harness = os.path.join(tmp.name, "harness.js")
+        with open(self.harness, "w", encoding="utf-8") as f:
+            f.write(HARNESS)
+
+    def resume(self, mode, index):
+        saved = json.dumps({"mode": mode, "index": index, "seg": 0})
+        out = subprocess.run(["node", self.harness, self.page, HTML_DIR, saved],
+                             capture_output=True, text=True, timeout=60, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    def test_single_session_reads_one_verse_after_reload(self):
+        result = self.resume("single", 5)
+        self.assertEqual(result, {"spoken": [5], "state": "idle"})
+
+    def test_random_session_does_not_repeat_the_saved_verse(self):
+        result = self.resume("random", 5)
+        self.assertEqual(result["spoken"][0], 5)
+        self.assertEqual(result["spoken"].count(5), 1)
+
+    def test_seq_session_continues_in_order(self):
+        self.assertEqual(self.resume("seq", 5)["spoken"], [5, 6, 7, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
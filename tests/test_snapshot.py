@@ -0,0 +1,57 @@
+# tests/test_snapshot.py
+"""
+Snapshot freshness: a touched but unchanged source is re-stamped once, so
+later loads are stat-only again.
+
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from data import snapshot
+
+SECTION_MAP = {"SECTION_T": "section_t"}
+SECTION = {"Problem": [{"id": 1, "chapter": 2, "verse": 47, "sanskrit": "s",
+                        "hindi_arth": "h", "saral_samajh": "m", "udaharan": "u"}]}
+
+
+class SnapshotStampTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(snapshot, "DATA_DIR", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.source = snapshot.section_source_path("SECTION_T")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(f"section_t = {SECTION!r}\n")
+        self.path = os.path.join(tmp.name, "shlokas.snap")
+        snapshot.write_snapshot({"SECTION_T": SECTION}, SECTION_MAP, self.path)
+
+    def load(self):
+        with mock.patch.object(snapshot, "source_fingerprint",
+                               wraps=snapshot.source_fingerprint) as fingerprint:
+            snap = snapshot.load_snapshot(SECTION_MAP, self.path)
+        self.assertIsNotNone(snap)
+        snap.close()
+        return fingerprint.call_count
+
+    def test_touched_source_is_restamped(self):
+        self.assertEqual(self.load(), 0)
+        st = os.stat(self.source)
+        os.utime(self.source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(self.load(), 1)
+        self.assertEqual(self.load(), 0)
+
+    def test_edited_source_is_stale(self):
+        with open(self.source, "a", encoding="utf-8") as f:
+            f.write("# edited\n")
+        self.assertIsNone(snapshot.load_snapshot(SECTION_MAP, self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,380 @@
+"""
+Export verse records (data.verses.Verse) to files.
+
+Formats are small classes registered in FORMATS by name; each turns a batch
+of verses into one string, so a full-corpus export is a few hundred large
+writes through a 64 KiB buffer instead of thousands of tiny ones. Every
+export streams into `<path>.tmp` and is renamed into place when complete.
+
+    python -m utils.exporter --format csv --out exports/ --chapters 2,3
+"""
+
+import csv
+import html
+import io
+import json
 import os
+import threading
+import uuid
+import zipfile
+from datetime import datetime, timezone
+
+DEFAULT_PATH = "exported_shlokas.txt"
+DEFAULT_NAME = "exported_shlokas"
+BATCH_SIZE = 128
+BUFFER_SIZE = 1 << 16
+
+FORMATS = {}
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its cancel event is set."""
+
+
+def register_format(cls):
+    FORMATS[cls.name] = cls
+    return cls
+
+
+class Format:
+    """Base text format: header, one string per batch of verses, footer."""
+
+    name = ""
+    ext = ""
+
+    def open(self, path, verses):
+        return open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE)
+
+    def header(self):
+        return ""
+
+    def record(self, v):
+        raise NotImplementedError
+
+    def records(self, batch):
+        return "".join(map(self.record, batch))
+
+    def footer(self):
+        return ""
+
+    def close(self, stream):
+        stream.close()
+
+
+@register_format
+class TxtFormat(Format):
+    name = ext = "txt"
+
+    # The section line carries the problem title, as the page's "section"
+    # field does (generate_html.DEFAULT_FIELDS), not the module basename.
+    def record(self, s):
+        return (
+            f"{s.problem}\n{s.problem}\n{s.reference}\n{s.text}\n"
+            f"{s.meaning}\n{s.example}\n\n-----------------\n\n"
+        )
+
+
+@register_format
+class JsonLinesFormat(Format):
+    name = ext = "jsonl"
+
+    def record(self, v):
+        return json.dumps(v.to_dict(), ensure_ascii=False) + "\n"
+
+
+@register_format
+class CsvFormat(Format):
+    name = ext = "csv"
+    columns = ("id", "chapter", "verse", "section", "problem",
+               "sanskrit", "hindi_arth", "saral_samajh", "udaharan")
+
+    def header(self):
+        # BOM so spreadsheet apps pick UTF-8 for the Devanagari text.
+        return "\ufeff" + ",".join(self.columns) + "\r\n"
+
+    def records(self, batch):
+        buf = io.StringIO()
+        csv.writer(buf).writerows([getattr(v, c) for c in self.columns] for v in batch)
+        return buf.getvalue()
+
+
+@register_format
+class MarkdownFormat(Format):
+    name = "md"
+    ext = "md"
+
+    def __init__(self):
+        self._problem = None
+
+    def header(self):
+        return "# श्रीमद्भगवद्गीता\n\n"
+
+    def record(self, v):
+        out = ""
+        if v.problem != self._problem:
+            self._problem = v.problem
+            out = f"## {v.problem}\n\n"
+        text = v.text.replace("\n", "  \n")
+        return (
+            f"{out}### {v.reference}\n\n{text}\n\n"
+            f"**अर्थ:** {v.meaning}\n\n"
+            f"**सरल समझ:** {v.saral_samajh or '—'}\n\n"
+            f"**उदाहरण:** {v.example}\n\n"
+        )
+
 
-def export_to_txt(shlokas):
-    path = "exported_shlokas.txt"
+@register_format
+class EpubFormat(Format):
+    """EPUB 3: one XHTML document with a heading per problem title, plus a nav."""
 
-    with open(path, "w", encoding="utf-8") as f:
-        for s in shlokas:
-            f.write(f"{s.get('section','')}\n")
-            f.write(f"{s.get('problem','')}\n")
-            f.write(f"{s.get('sloka','' )}\n")
-            f.write(f"{s.get('text','')}\n")
-            f.write(f"{s.get('meaning','')}\n")
-            f.write(f"{s.get('example','')}\n")
-            f.write("\n-----------------\n\n")
+    name = ext = "epub"
+    title = "श्रीमद्भगवद्गीता"
 
+    def __init__(self):
+        self._zip = None
+        self._problems = {}
+
+    def open(self, path, verses):
+        for v in verses:
+            self._problems.setdefault(v.problem, len(self._problems))
+        self._zip = zf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        try:
+            # The mimetype entry must come first and be stored uncompressed.
+            zf.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", zipfile.ZIP_STORED)
+            zf.writestr("META-INF/container.xml", (
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+                '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+                '</rootfiles></container>'
+            ))
+            zf.writestr("OEBPS/content.opf", self._package())
+            zf.writestr("OEBPS/nav.xhtml", self._nav())
+            return io.TextIOWrapper(zf.open("OEBPS/verses.xhtml", "w"), encoding="utf-8")
+        except BaseException:
+            zf.close()      # export() never sees a stream to close
+            raise
+
+    def _package(self):
+        book_id = uuid.uuid5(uuid.NAMESPACE_URL, "bhagavad-gita-solutions:" + ",".join(self._problems))
+        modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="bookid" xml:lang="hi">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f'<dc:identifier id="bookid">urn:uuid:{book_id}</dc:identifier>'
+            f'<dc:title>{self.title}</dc:title><dc:language>hi</dc:language>'
+            f'<meta property="dcterms:modified">{modified}</meta></metadata>'
+            '<manifest>'
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+            '<item id="verses" href="verses.xhtml" media-type="application/xhtml+xml"/>'
+            '</manifest><spine><itemref idref="verses"/></spine></package>'
+        )
+
+    def _nav(self):
+        items = "".join(
+            f'<li><a href="verses.xhtml#p{n}">{html.escape(title)}</a></li>'
+            for title, n in self._problems.items()
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" xml:lang="hi">'
+            f'<head><title>{self.title}</title></head><body>'
+            f'<nav epub:type="toc"><ol>{items}</ol></nav></body></html>'
+        )
+
+    def header(self):
+        self._problem = None
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="hi">'
+            f'<head><title>{self.title}</title></head><body>\n'
+        )
+
+    def record(self, v):
+        esc = html.escape
+        out = ""
+        if v.problem != self._problem:
+            self._problem = v.problem
+            out = f'<h2 id="p{self._problems[v.problem]}">{esc(v.problem)}</h2>\n'
+        text = esc(v.text).replace("\n", "<br/>")
+        return (
+            f"{out}<h3>{esc(v.reference)}</h3>\n<p>{text}</p>\n"
+            f"<p><b>अर्थ:</b> {esc(v.meaning)}</p>\n"
+            f"<p><b>उदाहरण:</b> {esc(v.example)}</p>\n"
+        )
+
+    def footer(self):
+        return "</body></html>\n"
+
+    def close(self, stream):
+        try:
+            stream.close()
+        finally:
+            self._zip.close()
+
+
+def select(shlokas, sections=None, chapters=None, ids=None):
+    """
+    Filter verses. `sections` matches SECTION basenames ("SECTION_3") or
+    problem titles; `chapters` and `ids` are collections of ints. None means
+    no restriction.
+    """
+    if sections is None and chapters is None and ids is None:
+        return list(shlokas)
+    sections = set(sections) if sections is not None else None
+    chapters = set(chapters) if chapters is not None else None
+    ids = set(ids) if ids is not None else None
+    return [
+        v for v in shlokas
+        if (sections is None or v.section in sections or v.problem in sections)
+        and (chapters is None or v.chapter in chapters)
+        and (ids is None or v.id in ids)
+    ]
+
+
+def output_path(path, fmt):
+    """`path` may be a file name, a directory, or None (current directory)."""
+    if path is None or os.path.isdir(path) or path.endswith(os.sep):
+        return os.path.join(path or "", f"{DEFAULT_NAME}.{FORMATS[fmt].ext}")
+    return path
+
+
+def export(shlokas, fmt="txt", path=None, filter=None, progress=None, cancel=None,
+           batch_size=BATCH_SIZE):
+    """
+    Stream `shlokas` to `path` in format `fmt` and return the absolute path.
+
+    `filter` is a dict of select() arguments. The file is written to
+    `path + ".tmp"` and renamed into place when complete, so a cancelled or
+    failed export never leaves a half-written file. `progress(done, total)`
+    is called after every batch; setting the `cancel` event aborts with
+    ExportCancelled.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r} (have: {', '.join(FORMATS)})")
+    verses = select(shlokas, **(filter or {}))
+    path = output_path(path, fmt)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    writer = FORMATS[fmt]()
+    total = len(verses)
+    tmp = path + ".tmp"
+    try:
+        stream = writer.open(tmp, verses)
+        try:
+            stream.write(writer.header())
+            for start in range(0, total, batch_size):
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled(path)
+                stream.write(writer.records(verses[start:start + batch_size]))
+                if progress is not None:
+                    progress(min(start + batch_size, total), total)
+            stream.write(writer.footer())
+        finally:
+            writer.close(stream)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if progress is not None and total == 0:
+        progress(0, 0)
     return os.path.abspath(path)
+
+
+def export_to_txt(shlokas, path=DEFAULT_PATH, **kw):
+    return export(shlokas, "txt", path, **kw)
+
+
+class ExportJob:
+    """
+    Runs an export function on a daemon thread.
+
+    Callbacks are invoked on the worker thread; pass them through `dispatch`
+    (e.g. a wrapper around Kivy's Clock.schedule_once) to run them on the UI
+    thread instead. Exactly one of on_done(path), on_cancel() or on_error(exc)
+    is called when the job ends. Extra keyword options (fmt, path, filter...)
+    are passed on to `export`.
+    """
+
+    def __init__(self, shlokas, export=export, on_progress=None, on_done=None,
+                 on_cancel=None, on_error=None, dispatch=None, **options):
+        self.shlokas = list(shlokas)      # snapshot, so the UI may keep changing its list
+        self.export = export
+        self.options = options
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_cancel = on_cancel
+        self.on_error = on_error
+        self.dispatch = dispatch or (lambda fn, *args: fn(*args))
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="export", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _notify(self, callback, *args):
+        if callback is not None:
+            self.dispatch(callback, *args)
+
+    def _run(self):
+        progress = None
+        if self.on_progress is not None:
+            progress = lambda done, total: self._notify(self.on_progress, done, total)
+        try:
+            path = self.export(self.shlokas, progress=progress, cancel=self._cancel, **self.options)
+        except ExportCancelled:
+            self._notify(self.on_cancel)
+        except Exception as e:
+            self._notify(self.on_error, e)
+        else:
+            self._notify(self.on_done, path)
+
+
+__all__ = ["FORMATS", "Format", "register_format", "select", "export", "export_to_txt",
+           "ExportJob", "ExportCancelled"]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from data.verses import flatten
+
+    USAGE = ("usage: python -m utils.exporter [--format txt,csv,jsonl,md,epub] [--out PATH]\n"
+             "                                [--sections A,B] [--chapters 2,3] [--ids 1,2]")
+
+    def _arg(name, default=None):
+        if name not in sys.argv:
+            return default
+        i = sys.argv.index(name) + 1
+        if i >= len(sys.argv) or sys.argv[i].startswith("--"):
+            sys.exit(f"❌ {name} needs a value\n{USAGE}")
+        return sys.argv[i]
+
+    def _ints(value):
+        return [int(x) for x in value.split(",")] if value else None
+
+    sections = _arg("--sections")
+    filters = {
+        "sections": sections.split(",") if sections else None,
+        "chapters": _ints(_arg("--chapters")),
+        "ids": _ints(_arg("--ids")),
+    }
+    fmts = (_arg("--format") or "txt").split(",")
+    for fmt in fmts:
+        t0 = time.perf_counter()
+        out = export(flatten(), fmt, _arg("--out"), filter=filters)
+        print(f"✔ {fmt}: {out} ({os.path.getsize(out)} bytes, {(time.perf_counter() - t0) * 1000:.1f} ms)")
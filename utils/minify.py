@@ -0,0 +1,87 @@
+import gzip
+import os
+import re
+import shutil
+
+# Optional: brotli copies are only written when the module is installed.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_BLOCK_RE = re.compile(r"(<style[^>]*>.*?</style>|<script[^>]*>.*?</script>)", re.S | re.I)
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s*([{}:;,>])\s*")
+_SPACE_RE = re.compile(r"\s+")
+_BACKTICK_RE = re.compile(r"(?<!\\)`")
+
+
+def minify_css(css):
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _CSS_SPACE_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_js(js):
+    # Line based on purpose: indentation, blank lines and whole-line comments
+    # go, but newlines stay so automatic semicolon insertion is unaffected and
+    # nothing inside strings, regexes or template literals is rewritten.
+    # Lines that start inside a multi-line template literal are kept as-is.
+    lines = []
+    in_template = False
+    for line in js.splitlines():
+        if not in_template:
+            line = line.lstrip()
+            if not line or line.startswith("//"):
+                continue
+        if len(_BACKTICK_RE.findall(line)) % 2:
+            in_template = not in_template
+        lines.append(line if in_template else line.rstrip())
+    return "\n".join(lines)
+
+
+def minify_html(html):
+    """Conservative minifier for the page template (HTML with inline CSS/JS)."""
+    out = []
+    for i, part in enumerate(_BLOCK_RE.split(html)):
+        if i % 2:
+            open_end = part.index(">") + 1
+            close_start = part.rindex("<")
+            head, body, tail = part[:open_end], part[open_end:close_start], part[close_start:]
+            if head.lower().startswith("<style"):
+                body = minify_css(body)
+            else:
+                body = minify_js(body)
+            out.append(head + body + tail)
+        else:
+            out.append(_SPACE_RE.sub(" ", part))
+    return "".join(out).strip() + "\n"
+
+
+def precompress(path, formats=("gz",), dest=None):
+    """
+    Write precompressed copies of `path` as dest + ".gz" / ".br" (dest
+    defaults to `path`). Returns the list of paths written. Brotli is skipped
+    when the module is unavailable.
+    """
+    dest = dest or path
+    written = []
+    for fmt in formats:
+        out = f"{dest}.{fmt}"
+        if fmt == "gz":
+            # mtime=0 keeps the output byte-identical between builds.
+            with open(path, "rb") as src, open(out + ".tmp", "wb") as raw:
+                with gzip.GzipFile(filename="", mode="wb", compresslevel=9, fileobj=raw, mtime=0) as dst:
+                    shutil.copyfileobj(src, dst)
+        elif fmt == "br":
+            if brotli is None:
+                print("⚠️ Warning: brotli module not installed, skipping", out)
+                continue
+            with open(path, "rb") as src, open(out + ".tmp", "wb") as dst:
+                dst.write(brotli.compress(src.read()))
+        else:
+            raise ValueError(f"unknown precompression format {fmt!r}")
+        os.replace(out + ".tmp", out)
+        written.append(out)
+    return written
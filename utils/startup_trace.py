@@ -0,0 +1,99 @@
+"""
+Startup tracer for the desktop app.
+
+Enable with the GITA_TRACE_STARTUP environment variable (a file path, or 1
+for ./startup_trace.json) or the --trace-startup[=path] flag (after "--",
+since Kivy parses the command line: python main.py -- --trace-startup).
+
+Phases are recorded as Chrome trace events; open the JSON report in
+chrome://tracing or https://ui.perfetto.dev. Timestamps are relative to the
+moment this module was imported, so import it before anything else. When
+tracing is off every call is a no-op.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+ENV_VAR = "GITA_TRACE_STARTUP"
+FLAG = "--trace-startup"
+DEFAULT_PATH = "startup_trace.json"
+
+_T0 = time.perf_counter()
+
+
+def _requested_path():
+    for arg in sys.argv[1:]:
+        if arg == FLAG:
+            return DEFAULT_PATH
+        if arg.startswith(FLAG + "="):
+            return arg.split("=", 1)[1] or DEFAULT_PATH
+    value = os.environ.get(ENV_VAR, "")
+    if value and value != "0":
+        return DEFAULT_PATH if value == "1" else value
+    return None
+
+
+class StartupTracer:
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = path is not None
+        self.events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _now_us():
+        return (time.perf_counter() - _T0) * 1e6
+
+    def _add(self, event):
+        thread = threading.current_thread()
+        event["pid"] = os.getpid()
+        event["tid"] = thread.ident
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self.events.append(event)
+
+    def phase(self, name, cat="startup"):
+        """Context manager recording `name` as a complete ("X") event."""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name, cat)
+
+    @contextmanager
+    def _phase(self, name, cat):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._add({"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self._now_us() - start})
+
+    def mark(self, name, cat="startup"):
+        """Instant event, e.g. the first frame."""
+        if self.enabled:
+            self._add({"name": name, "cat": cat, "ph": "i", "s": "p", "ts": self._now_us()})
+
+    def write(self, path=None):
+        if not self.enabled:
+            return None
+        path = path or self.path
+        with self._lock:
+            events = list(self.events)
+            meta = [
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f, indent=1)
+        os.replace(tmp, path)
+        print(f"⏱  Startup trace written: {os.path.abspath(path)}")
+        return path
+
+
+TRACE = StartupTracer(_requested_path())
+
+__all__ = ["TRACE", "StartupTracer"]
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+
+class TextureCache:
+    """
+    Small LRU cache for rendered text (textures or layouts).
+
+    `render(key)` does the expensive work — shaping and rasterising a verse —
+    and is only called on a miss. Keys are whatever identifies one rendering,
+    e.g. (verse index, font size, wrap width).
+
+    `schedule(fn)` defers a call to a later frame and returns its event (e.g.
+    Clock.schedule_once); prefetch() uses it to warm neighbouring entries one
+    per frame so selecting them later is a plain texture swap. At most one
+    such event is pending at a time, however often prefetch() is called.
+    Rendering itself has to stay on the thread that owns the GL context,
+    which is why prefetching is spread over frames rather than handed to a
+    worker thread.
+    """
+
+    def __init__(self, render, capacity=24, schedule=None):
+        self.render = render
+        self.capacity = capacity
+        self.schedule = schedule
+        self._items = OrderedDict()
+        self._pending = []
+        self._event = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+        self.misses += 1
+        item = self.render(key)
+        self._put(key, item)
+        return item
+
+    def _put(self, key, item):
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def prefetch(self, keys):
+        """Render `keys` that are not cached yet, one per scheduled frame."""
+        # A newer prefetch replaces the old queue: only the neighbours of the
+        # verse currently on screen are worth rendering.
+        self._pending = [k for k in keys if k not in self._items]
+        self._schedule_next()
+
+    def _schedule_next(self):
+        # The pending event reads self._pending when it fires, so a new
+        # queue reuses it instead of starting a second chain.
+        if self._pending and self._event is None and self.schedule is not None:
+            self._event = self.schedule(self._prefetch_next)
+
+    def _prefetch_next(self, *args):
+        self._event = None
+        while self._pending:
+            key = self._pending.pop(0)
+            if key not in self._items:
+                self._put(key, self.render(key))
+                break
+        self._schedule_next()
+
+    def retain(self, keep):
+        """Drop cached and queued entries whose key fails `keep(key)`."""
+        for key in [k for k in self._items if not keep(k)]:
+            del self._items[key]
+        self._pending = [k for k in self._pending if keep(k)]
+
+    def clear(self):
+        self._items.clear()
+        self._pending = []
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
@@ -0,0 +1,94 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+
+HEADER_VIEW = "GroupHeader"
+ROW_VIEW = "ProblemRow"
+
+
+class VerseRows(Sequence):
+    """
+    RecycleView data computed from the verse store: a row's dict is built
+    when it is read and not kept, so no list of one dict per verse is held.
+    The layout still reads every row on each refresh.
+
+    Verses are grouped under a header row per problem title; groups can be
+    collapsed. With `indices` (e.g. search hits) the rows are a flat list of
+    those verses, in that order, without headers. `pending` titles (problems
+    of sections still being decoded at startup) follow as empty headers.
+
+    Rows carry no size: headers and verse rows share the layout's
+    default_size (gita.kv), so the layout needs nothing from a row but its
+    viewclass.
+    """
+
+    def __init__(self, verses, indices=None, collapsed=(), pending=()):
+        self.verses = verses
+        self.collapsed = set(collapsed)
+        self._flat = list(indices) if indices is not None else None
+
+        # group g covers verses[group_start[g]:group_start[g + 1]]
+        self.group_titles = []
+        self.group_start = array("l")
+        if self._flat is None:
+            last = None
+            for i, v in enumerate(verses):
+                if v.problem != last:
+                    self.group_titles.append(v.problem)
+                    self.group_start.append(i)
+                    last = v.problem
+            self.group_start.append(len(verses))
+            self._loaded_groups = len(self.group_titles)
+            for title in pending:
+                self.group_titles.append(title)
+                self.group_start.append(len(verses))
+        self._rebuild()
+
+    def _rebuild(self):
+        # row_start[g] = row index of group g's header; rows are recomputed
+        # only when a group is toggled, never per scroll.
+        self.row_start = array("l")
+        n = 0
+        for g in range(len(self.group_titles)):
+            self.row_start.append(n)
+            n += 1
+            if g not in self.collapsed:
+                n += self.group_start[g + 1] - self.group_start[g]
+        self._len = n if self._flat is None else len(self._flat)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[r] for r in range(*row.indices(self._len))]
+        if row < 0:
+            row += self._len
+        if not 0 <= row < self._len:
+            raise IndexError(row)
+
+        if self._flat is not None:
+            i = self._flat[row]
+            v = self.verses[i]
+            return {"viewclass": ROW_VIEW, "text": f"{v.problem} ({v.reference})",
+                    "index": i}
+
+        g = bisect_right(self.row_start, row) - 1
+        offset = row - self.row_start[g]
+        if offset == 0:
+            count = self.group_start[g + 1] - self.group_start[g]
+            if g >= self._loaded_groups:
+                count = "…"
+            arrow = "▸" if g in self.collapsed else "▾"
+            return {"viewclass": HEADER_VIEW, "text": f"{arrow} {self.group_titles[g]} ({count})",
+                    "group": g}
+        i = self.group_start[g] + offset - 1
+        return {"viewclass": ROW_VIEW, "text": self.verses[i].reference,
+                "index": i}
+
+    def toggle(self, group):
+        if group in self.collapsed:
+            self.collapsed.discard(group)
+        else:
+            self.collapsed.add(group)
+        self._rebuild()